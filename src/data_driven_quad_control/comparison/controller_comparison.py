@@ -25,7 +25,9 @@ Simulation overview:
 
 5. The comparison simulation starts, handled by the main simulation process,
    which manages the vectorized environment stepping and communication with the
-   controller processes via multiprocessing queues.
+   controller processes via shared memory. By default, the environment is
+   stepped in lockstep with all controllers. Optionally, it can be stepped
+   asynchronously, reusing the last action of slower controllers.
 
    Each parallel controller process controls its corresponding drone to follow
    the setpoints defined in the main YAML config file.
@@ -136,6 +138,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Enable video recording of the simulation.",
     )
+    parser.add_argument(
+        "--async_stepping",
+        action="store_true",
+        help="Step the environment asynchronously, without waiting for slower "
+        "controllers to compute their actions.",
+    )
     parser.add_argument(
         "--verbose",
         type=int,
@@ -155,6 +163,7 @@ def main() -> None:
     headless = args.headless
     seed = args.seed
     record = args.record
+    async_stepping = args.async_stepping
     verbose = args.verbose
 
     if verbose:
@@ -331,6 +340,7 @@ def main() -> None:
             steps_per_setpoint=controller_comparison_params.steps_per_setpoint,
             min_at_target_steps=min_at_target_steps,
             error_threshold=error_threshold,
+            async_stepping=async_stepping,
             verbose=verbose,
         )
 
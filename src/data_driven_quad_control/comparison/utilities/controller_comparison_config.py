@@ -41,7 +41,7 @@ class RLControllerInitData(NamedTuple):
     initial_observation: torch.Tensor
 
 
-@dataclass
+@dataclass(slots=True)
 class SimInfo:
     in_progress: bool = True
     steps_since_target_set: int = 0
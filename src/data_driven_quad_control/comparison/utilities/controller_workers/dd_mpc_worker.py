@@ -5,10 +5,11 @@ This module defines a parallel worker function that initializes and runs a
 nonlinear data-driven MPC controller in closed loop to control the position of
 a drone in a vectorized environment.
 
-The worker communicates with the main process via multiprocessing queues.
+The worker communicates with the main process via shared memory (a target
+signal broadcast channel, action slots, and ring buffers).
 """
 
-import torch.multiprocessing as mp
+import torch
 from direct_data_driven_mpc.utilities.controller.controller_creation import (
     create_nonlinear_data_driven_mpc_controller,
 )
@@ -17,14 +18,21 @@ from ..controller_comparison_config import (
     DDMPCControllerInitData,
     EnvTargetSignal,
 )
+from ..cpu_affinity import pin_worker_to_cpu
+from ..shared_memory_ipc import (
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+)
 
 
 def dd_mpc_controller_worker(
     env_idx: int,
     dd_mpc_controller_init_data: DDMPCControllerInitData,
-    target_signal_queue: mp.Queue,
-    action_queue: mp.Queue,
-    dd_mpc_obs_queue: mp.Queue,
+    target_signal: SharedTargetSignal,
+    action_slots: SharedActionSlots,
+    dd_mpc_obs_ring: SharedMemoryRing,
+    cpu: int | None = None,
 ) -> None:
     """
     Parallel worker for a nonlinear data-driven MPC (DD-MPC) controller.
@@ -33,28 +41,41 @@ def dd_mpc_controller_worker(
     initialization data and runs it in closed loop to control the position
     of a drone in simulation.
 
-    The worker communicates with the main process via multiprocessing queues
-    to perform the following tasks:
+    The worker communicates with the main process via shared memory to
+    perform the following tasks:
     - Receive target position updates and simulation termination signals.
     - Receive drone position observations.
     - Send control actions.
 
+    Note:
+        A target signal is received at every simulation step, including the
+        intermediate steps of multi-step control cycles (`n_mpc_step > 1`),
+        so that each ring is read exactly once per step. Target updates
+        received within a cycle take effect from the next MPC solve.
+
     Args:
         env_idx (int): The index of the drone controlled by the DD-MPC
             controller.
         dd_mpc_controller_init_data (DDMPCControllerInitData): The DD-MPC
             controller initialization data.
-        target_signal_queue (mp.Queue): A queue used for receiving
-            `EnvTargetSignal` messages from the main process. Each message
-            includes the current target position, a flag indicating whether
-            it's a new target (used to trigger controller target updates), and
-            a done signal indicating whether the simulation will be terminated.
-        action_queue (mp.Queue): A queue used for sending control actions to
-            the main process for environment stepping.
-        dd_mpc_obs_queue (mp.Queue): A queue used for receiving environment
-            observations (drone positions as Numpy arrays) from the main
-            process.
+        target_signal (SharedTargetSignal): A shared channel used for
+            receiving `EnvTargetSignal` messages broadcast by the main
+            process. Each message includes the current target position, a
+            flag indicating whether it's a new target (used to trigger
+            controller target updates), and a done signal indicating whether
+            the simulation will be terminated.
+        action_slots (SharedActionSlots): Shared action slots used for
+            sending control actions to the main process for environment
+            stepping. The worker writes into the slot at `env_idx`.
+        dd_mpc_obs_ring (SharedMemoryRing): A ring used for receiving
+            environment observations (drone positions) from the main process.
+        cpu (int | None): The CPU core the worker process is pinned to
+            before its setup. If `None`, the CPU affinity of the worker is
+            left unchanged. Defaults to `None`.
     """
+    # Pin the worker to its CPU core before its setup starts any threads
+    pin_worker_to_cpu(cpu)
+
     # Create nonlinear data-driven MPC controller
     dd_mpc_controller = create_nonlinear_data_driven_mpc_controller(
         controller_config=dd_mpc_controller_init_data.controller_config,
@@ -65,48 +86,53 @@ def dd_mpc_controller_worker(
     # Retrieve controller parameters
     n_mpc_step = dd_mpc_controller.n_mpc_step
 
+    # Pre-allocate buffers for reading ring payloads
+    obs_buffer = torch.zeros(3)
+
     # Run the Nonlinear Data-Driven MPC controller in closed loop
+    step = 0
     while True:
         # Receive target signal from the main process
-        target_signal: EnvTargetSignal = target_signal_queue.get()
+        env_target_signal: EnvTargetSignal = target_signal.receive(env_idx)
 
         # Update control setpoint if the target position changes
-        if target_signal.is_new_target:
-            target_pos_tensor = target_signal.target_pos
+        if env_target_signal.is_new_target:
+            target_pos_tensor = env_target_signal.target_pos
             target_pos = target_pos_tensor.cpu().numpy().reshape(-1, 1)
 
             dd_mpc_controller.set_output_setpoint(y_r=target_pos)
 
         # Update and solve the Data-Driven MPC problem
-        dd_mpc_controller.update_and_solve_data_driven_mpc()
-
-        # Controller closed loop for `n_mpc_step` steps
-        for n_step in range(n_mpc_step):
-            # Update control input
-            optimal_u_step_n = (
-                dd_mpc_controller.get_optimal_control_input_at_step(
-                    n_step=n_step
-                )
-            )
-            u_k = optimal_u_step_n
-
-            # Send action (control input) to the main process
-            action_queue.put((env_idx, u_k))
-
-            # Get observations from vectorized environment
-            drone_pos = dd_mpc_obs_queue.get()
-
-            # Retrieve system output from observations for the current env
-            y_k = drone_pos
-
-            # Update input-output measurements online
-            du_current = dd_mpc_controller.get_du_value_at_step(n_step=n_step)
-            dd_mpc_controller.store_input_output_measurement(
-                u_current=u_k,
-                y_current=y_k,
-                du_current=du_current,
-            )
+        # at the start of each control cycle of `n_mpc_step` steps
+        n_step = step % n_mpc_step
+        if n_step == 0:
+            dd_mpc_controller.update_and_solve_data_driven_mpc()
+
+        # Update control input
+        optimal_u_step_n = dd_mpc_controller.get_optimal_control_input_at_step(
+            n_step=n_step
+        )
+        u_k = optimal_u_step_n
+
+        # Send action (control input) to the main process
+        action_slots.write(env_idx, u_k)
+
+        # Get observations from vectorized environment
+        drone_pos = dd_mpc_obs_ring.read_into(obs_buffer).numpy()
+
+        # Retrieve system output from observations for the current env
+        y_k = drone_pos
+
+        # Update input-output measurements online
+        du_current = dd_mpc_controller.get_du_value_at_step(n_step=n_step)
+        dd_mpc_controller.store_input_output_measurement(
+            u_current=u_k,
+            y_current=y_k,
+            du_current=du_current,
+        )
 
         # Stop simulation if main process signals termination
-        if target_signal.done:
+        if env_target_signal.done:
             return
+
+        step += 1
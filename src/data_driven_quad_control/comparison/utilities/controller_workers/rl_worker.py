@@ -5,7 +5,9 @@ This module defines a parallel worker function that initializes and runs a
 Reinforcement Learning controller (trained PPO policy) in closed loop to
 control the position of a drone in a vectorized environment.
 
-The worker communicates with the main process via multiprocessing queues.
+The worker communicates with the main process via shared memory (a target
+signal broadcast channel, action slots, and an observation channel shared on
+the environment device).
 """
 
 import contextlib
@@ -13,13 +15,18 @@ import io
 from typing import Any
 
 import torch
-import torch.multiprocessing as mp
 from rsl_rl.runners import OnPolicyRunner
 
 from ..controller_comparison_config import (
     EnvTargetSignal,
     RLControllerInitData,
 )
+from ..cpu_affinity import pin_worker_to_cpu
+from ..shared_memory_ipc import (
+    SharedActionSlots,
+    SharedTargetSignal,
+    SharedTensorChannel,
+)
 
 
 class DummyHoverEnv:
@@ -61,9 +68,10 @@ def rl_controller_worker(
     env_idx: int,
     env_specs: dict[str, Any],
     rl_controller_init_data: RLControllerInitData,
-    target_signal_queue: mp.Queue,
-    action_queue: mp.Queue,
-    rl_obs_queue: mp.Queue,
+    target_signal: SharedTargetSignal,
+    action_slots: SharedActionSlots,
+    rl_obs_channel: SharedTensorChannel,
+    cpu: int | None = None,
 ) -> None:
     """
     Parallel worker for a Reinforcement Learning (RL) controller (trained PPO
@@ -73,8 +81,8 @@ def rl_controller_worker(
     PPO model) from the provided initialization data and runs it in closed loop
     to control the position of a drone in simulation.
 
-    The worker communicates with the main process via multiprocessing queues
-    to perform the following tasks:
+    The worker communicates with the main process via shared memory to
+    perform the following tasks:
     - Receive target position updates and simulation termination signals.
     - Receive drone environment observations.
     - Send control actions.
@@ -86,17 +94,26 @@ def rl_controller_worker(
             policy.
         rl_controller_init_data (RLControllerInitData): The RL controller
             initialization data.
-        target_signal_queue (mp.Queue): A queue used for receiving
-            `EnvTargetSignal` messages from the main process. Each message
-            includes the current target position, a flag indicating whether
-            it's a new target (used to trigger controller target updates), and
-            a done signal indicating whether the simulation will be terminated.
-        action_queue (mp.Queue): A queue used for sending control actions to
-            the main process for environment stepping.
-        rl_obs_queue (mp.Queue): A queue used for receiving environment
-            observations from the main process. Each observation is the raw
-            observation buffer from the `HoverEnv` environment.
+        target_signal (SharedTargetSignal): A shared channel used for
+            receiving `EnvTargetSignal` messages broadcast by the main
+            process. Each message includes the current target position, a
+            flag indicating whether it's a new target (used to trigger
+            controller target updates), and a done signal indicating whether
+            the simulation will be terminated.
+        action_slots (SharedActionSlots): Shared action slots used for
+            sending control actions to the main process for environment
+            stepping. The worker writes into the slot at `env_idx`.
+        rl_obs_channel (SharedTensorChannel): A channel used for receiving
+            environment observations from the main process, shared on the
+            environment device. Each observation is the raw observation
+            buffer from the `HoverEnv` environment.
+        cpu (int | None): The CPU core the worker process is pinned to
+            before its setup. If `None`, the CPU affinity of the worker is
+            left unchanged. Defaults to `None`.
     """
+    # Pin the worker to its CPU core before its setup starts any threads
+    pin_worker_to_cpu(cpu)
+
     # Create dummy env with the attributes required by
     # `OnPolicyRunner` to initialize the PPO policy
     env = DummyHoverEnv(env_specs)
@@ -116,20 +133,23 @@ def rl_controller_worker(
     # Initialize observation
     obs = rl_controller_init_data.initial_observation
 
+    # Pre-allocate a device buffer for reading channel payloads
+    obs_buffer = torch.zeros(env.num_obs, device=env.device)
+
     # Evaluate policy in simulation
     while True:
         # Receive target signal from the main process
-        target_signal: EnvTargetSignal = target_signal_queue.get()
+        env_target_signal: EnvTargetSignal = target_signal.receive(env_idx)
 
         # Compute action
         action = policy(obs)
 
         # Send action to the main process
-        action_queue.put((env_idx, action.detach()))
+        action_slots.write(env_idx, action.detach())
 
         # Get observations from vectorized environment
-        obs = rl_obs_queue.get()
+        obs = rl_obs_channel.read_into(obs_buffer)
 
         # Stop simulation if main process signals termination
-        if target_signal.done:
+        if env_target_signal.done:
             break
@@ -5,11 +5,11 @@ This module defines a parallel worker function that initializes and runs a
 tracking controller in closed loop to control the position of a drone in a
 vectorized environment.
 
-The worker communicates with the main process via multiprocessing queues.
+The worker communicates with the main process via shared memory (a target
+signal broadcast channel, action slots, and ring buffers).
 """
 
 import torch
-import torch.multiprocessing as mp
 
 from data_driven_quad_control.controllers.tracking.tracking_controller import (
     DroneTrackingController,
@@ -25,15 +25,22 @@ from ..controller_comparison_config import (
     EnvTargetSignal,
     TrackingControllerInitData,
 )
+from ..cpu_affinity import pin_worker_to_cpu
+from ..shared_memory_ipc import (
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+)
 
 
 def tracking_controller_worker(
     env_idx: int,
     env_device: torch.device,
     tracking_controller_init_data: TrackingControllerInitData,
-    target_signal_queue: mp.Queue,
-    action_queue: mp.Queue,
-    tracking_obs_queue: mp.Queue,
+    target_signal: SharedTargetSignal,
+    action_slots: SharedActionSlots,
+    tracking_obs_ring: SharedMemoryRing,
+    cpu: int | None = None,
 ) -> None:
     """
     Parallel worker for a tracking controller.
@@ -42,8 +49,8 @@ def tracking_controller_worker(
     initialization data and runs it in closed loop to control the position
     of a drone in simulation.
 
-    The worker communicates with the main process via multiprocessing queues
-    to perform the following tasks:
+    The worker communicates with the main process via shared memory to
+    perform the following tasks:
     - Receive target position updates and simulation termination signals.
     - Receive drone position and quaternion observations.
     - Send control actions.
@@ -54,18 +61,25 @@ def tracking_controller_worker(
         env_device (torch.device): The drone environment device.
         tracking_controller_init_data (TrackingControllerInitData): The
             tracking controller initialization data.
-        target_signal_queue (mp.Queue): A queue used for receiving
-            `EnvTargetSignal` messages from the main process. Each message
-            includes the current target position, a flag indicating whether
-            it's a new target (used to trigger controller target updates), and
-            a done signal indicating whether the simulation will be terminated.
-        action_queue (mp.Queue): A queue used for sending control actions to
-            the main process for environment stepping.
-        tracking_obs_queue (mp.Queue): A queue used for receiving environment
-            observations (`TrackingCtrlDroneState`) from the main process,
-            containing the current drone position and orientation (as a
-            quaternion).
+        target_signal (SharedTargetSignal): A shared channel used for
+            receiving `EnvTargetSignal` messages broadcast by the main
+            process. Each message includes the current target position, a
+            flag indicating whether it's a new target (used to trigger
+            controller target updates), and a done signal indicating whether
+            the simulation will be terminated.
+        action_slots (SharedActionSlots): Shared action slots used for
+            sending control actions to the main process for environment
+            stepping. The worker writes into the slot at `env_idx`.
+        tracking_obs_ring (SharedMemoryRing): A ring used for receiving
+            environment observations from the main process, containing the
+            current drone position (3) and orientation quaternion (4).
+        cpu (int | None): The CPU core the worker process is pinned to
+            before its setup. If `None`, the CPU affinity of the worker is
+            left unchanged. Defaults to `None`.
     """
+    # Pin the worker to its CPU core before its setup starts any threads
+    pin_worker_to_cpu(cpu)
+
     # Create drone tracking controller
     tracking_controller = DroneTrackingController(
         drone_mass=EnvDroneParams.MASS,
@@ -87,13 +101,16 @@ def tracking_controller_worker(
     # Initialize current drone state
     current_state = tracking_controller_init_data.initial_state
 
+    # Pre-allocate buffers for reading ring payloads
+    obs_buffer = torch.zeros(7)
+
     while True:
         # Receive target signal from the main process
-        target_signal: EnvTargetSignal = target_signal_queue.get()
+        env_target_signal: EnvTargetSignal = target_signal.receive(env_idx)
 
         # Update target state position if it changes
-        if target_signal.is_new_target:
-            target_pos = target_signal.target_pos
+        if env_target_signal.is_new_target:
+            target_pos = env_target_signal.target_pos.to(env_device)
             target_state.X = target_pos
 
         # Compute CTBR action from tracking controller
@@ -105,15 +122,15 @@ def tracking_controller_worker(
         ctrl_action = ctrl_action[:, :-1]
 
         # Send action (control input) to the main process
-        action_queue.put((env_idx, ctrl_action))
+        action_slots.write(env_idx, ctrl_action)
 
         # Get observations from vectorized environment
-        env_obs: TrackingCtrlDroneState = tracking_obs_queue.get()
+        tracking_obs_ring.read_into(obs_buffer)
 
         # Update current drone state
-        current_state.X = env_obs.X
-        current_state.Q = env_obs.Q
+        current_state.X = obs_buffer[:3].unsqueeze(0).to(env_device, copy=True)
+        current_state.Q = obs_buffer[3:].unsqueeze(0).to(env_device, copy=True)
 
         # Stop simulation if main process signals termination
-        if target_signal.done:
+        if env_target_signal.done:
             break
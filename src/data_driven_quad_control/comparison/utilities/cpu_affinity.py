@@ -0,0 +1,105 @@
+"""
+CPU affinity utilities for parallel controller workers.
+
+This module implements the CPU core assignment used by the main simulation
+process and the controller workers, so that processes communicating through
+shared memory run on distinct CPU cores instead of competing for the same
+ones or being migrated between them while they wait on each other.
+
+Note:
+    On Linux, `os.sched_setaffinity` only applies to the thread whose ID is
+    given, not to the whole process. Threads started by a process (e.g., the
+    PyTorch intra-op thread pool or CUDA threads) inherit the affinity of the
+    thread that creates them, so threads that already exist when the
+    affinity is set must be updated individually.
+"""
+
+import os
+
+# Directory listing the thread IDs of the current process (Linux)
+_PROC_SELF_TASK_DIR = "/proc/self/task"
+
+
+def set_process_cpu_affinity(cpus: set[int]) -> None:
+    """
+    Set the CPU affinity of every thread of the current process.
+
+    The affinity is set for the calling thread and for every thread listed
+    in `/proc/self/task`. If the thread list is not available, only the
+    calling thread is updated.
+
+    Args:
+        cpus (set[int]): The CPU cores the process threads are allowed to run
+            on.
+    """
+    os.sched_setaffinity(0, cpus)
+
+    try:
+        thread_ids = [int(tid) for tid in os.listdir(_PROC_SELF_TASK_DIR)]
+    except OSError:
+        return
+
+    for thread_id in thread_ids:
+        try:
+            os.sched_setaffinity(thread_id, cpus)
+        except ProcessLookupError:
+            pass  # Thread already exited
+
+
+def pin_worker_to_cpu(cpu: int | None) -> None:
+    """
+    Pin the current worker process and all of its threads to a CPU core.
+
+    This function must be called at the start of a worker function, before
+    its controller or environment setup starts any threads.
+
+    Args:
+        cpu (int | None): The CPU core assigned to the worker. If `None`,
+            the CPU affinity is left unchanged.
+    """
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return
+
+    set_process_cpu_affinity({cpu})
+
+
+def reserve_worker_cpus(
+    num_workers: int,
+) -> tuple[list[int | None], set[int] | None]:
+    """
+    Assign a distinct CPU core to each worker and restrict the main process
+    (all of its threads) to the remaining cores.
+
+    This function must be called before starting the workers, which pin
+    themselves to their assigned cores with `pin_worker_to_cpu`. CPU cores
+    are not assigned if the platform does not support setting CPU
+    affinities or if there are not enough CPU cores available. The caller
+    is responsible for restoring the main process affinity with
+    `set_process_cpu_affinity`.
+
+    Args:
+        num_workers (int): The number of workers.
+
+    Returns:
+        tuple[list[int | None], set[int] | None]: A tuple containing:
+            - The CPU core assigned to each worker, or `None` for every
+              worker if no cores were assigned.
+            - The original CPU affinity of the main process, or `None` if no
+              cores were assigned.
+    """
+    unassigned_cpus: list[int | None] = [None] * num_workers
+
+    if not hasattr(os, "sched_setaffinity"):
+        return unassigned_cpus, None
+
+    main_process_cpus = os.sched_getaffinity(0)
+    available_cpus = sorted(main_process_cpus)
+
+    # Keep at least one core for the main process
+    if num_workers == 0 or len(available_cpus) <= num_workers:
+        return unassigned_cpus, None
+
+    worker_cpus: list[int | None] = list(available_cpus[-num_workers:])
+    set_process_cpu_affinity(main_process_cpus - set(worker_cpus))
+
+    return worker_cpus, main_process_cpus
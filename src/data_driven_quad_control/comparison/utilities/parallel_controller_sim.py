@@ -4,7 +4,7 @@ Run the main process of a data-driven controller comparison.
 This module implements the main process responsible for managing the creation
 of parallel controller processes (workers) and the vectorized environment
 stepping, which requires bidirectional communication with the controller
-workers through multiprocessing queues.
+workers through shared memory.
 
 The main process also collects control trajectory data during simulation,
 including of control inputs, drone positions, and target setpoints, for all
@@ -16,9 +16,6 @@ import numpy as np
 import torch
 import torch.multiprocessing as mp
 
-from data_driven_quad_control.controllers.tracking.tracking_controller_config import (  # noqa: E501
-    TrackingCtrlDroneState,
-)
 from data_driven_quad_control.envs.hover_env import HoverEnv
 from data_driven_quad_control.utilities.control_data_plotting import (
     ControlTrajectory,
@@ -26,7 +23,6 @@ from data_driven_quad_control.utilities.control_data_plotting import (
 from data_driven_quad_control.utilities.drone_environment import (
     update_env_target_pos,
 )
-from data_driven_quad_control.utilities.math_utils import linear_interpolate
 
 from .controller_comparison_config import EnvTargetSignal, SimInfo
 from .controller_workers.dd_mpc_worker import (
@@ -41,6 +37,17 @@ from .controller_workers.tracking_worker import (
     TrackingControllerInitData,
     tracking_controller_worker,
 )
+from .cpu_affinity import reserve_worker_cpus, set_process_cpu_affinity
+from .shared_memory_ipc import (
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+    SharedTensorChannel,
+)
+
+# Initial number of history steps allocated per setpoint when the number of
+# steps is not fixed (i.e., drones must stabilize at each setpoint)
+INITIAL_HISTORY_STEPS_PER_SETPOINT = 500
 
 
 def parallel_controller_simulation(
@@ -55,6 +62,7 @@ def parallel_controller_simulation(
     steps_per_setpoint: int | None = None,
     min_at_target_steps: int = 10,
     error_threshold: float = 5e-2,
+    async_stepping: bool = False,
     verbose: int = 0,
 ) -> ControlTrajectory:
     """
@@ -73,7 +81,20 @@ def parallel_controller_simulation(
     independently control its assigned drone.
 
     The main process manages the stepping of the vectorized environment,
-    communicating synchronously with the workers via multiprocessing queues.
+    communicating synchronously with the workers via shared memory. Target
+    signals are broadcast to all workers through a single shared channel,
+    control actions are written by each worker into its slot of a shared
+    action tensor, and observations are sent through ring buffers (one per
+    worker).
+
+    By default, the environment is stepped in lockstep with all the workers.
+    If asynchronous stepping is enabled, the environment is stepped as soon
+    as any worker sends a new action, reusing the last action of the drones
+    whose workers are still computing theirs. This prevents slow controllers
+    (e.g., DD-MPC, which solves an optimization problem) from gating faster
+    ones. The first step still waits for all workers, so that every drone is
+    stepped with an action computed by its controller. In this mode, the
+    freshness of each drone action is recorded in the control trajectory data.
 
     The drone controllers are evaluated over a sequence of target setpoints,
     which are updated simultaneously when all drones stabilize at them
@@ -105,6 +126,9 @@ def parallel_controller_simulation(
             list. Defaults to 10.
         error_threshold (float): The maximum allowable position error to
             consider drones "at their target". Defaults to 5e-2.
+        async_stepping (bool): If `True`, the environment is stepped as soon
+            as any worker sends a new action, instead of waiting for all
+            workers. Defaults to `False`.
         record (bool): If `True`, enables recording the simulation. Defaults to
             `False`.
         video_fps (int): The FPS value for the simulation recording. Unused if
@@ -126,237 +150,516 @@ def parallel_controller_simulation(
     env_action_bounds = env.action_bounds  # Env action bounds used for
     # control action normalization
 
-    # Create multiprocessing queues for synchronous
-    # communication with the vectorized environment
-    target_signal_queue: mp.Queue = mp.Queue()
-    action_queue: mp.Queue = mp.Queue()
-    tracking_obs_queue: mp.Queue = mp.Queue()
-    dd_mpc_obs_queue: mp.Queue = mp.Queue()
-    rl_obs_queue: mp.Queue = mp.Queue()
-
-    # Create and start controller worker processes
-    processes: list[mp.Process] = []
-
-    if verbose:
-        print("Creating parallel processes for each controller")
-
-    # Tracking controller
-    if verbose:
-        print("  Initializing tracking controller")
-
-    tracking_controller_process = mp.Process(
-        target=tracking_controller_worker,
-        args=(
-            tracking_env_idx,
-            env.device,
-            tracking_controller_init_data,
-            target_signal_queue,
-            action_queue,
-            tracking_obs_queue,
-        ),
-    )
-    processes.append(tracking_controller_process)
-    tracking_controller_process.start()
-
-    # RL controller (trained PPO policy)
-    if verbose:
-        print("  Initializing Reinforcement Learning controller")
-
-    env_specs = {
-        "device": env.device,
-        "step_dt": env.step_dt,
-        "num_envs": env.num_envs,
-        "num_obs": env.num_obs,
-        "num_actions": env.num_actions,
-        "max_episode_length": env.max_episode_length,
-    }
-    rl_agent_process = mp.Process(
-        target=rl_controller_worker,
-        args=(
-            rl_env_idx,
-            env_specs,
-            rl_controller_init_data,
-            target_signal_queue,
-            action_queue,
-            rl_obs_queue,
-        ),
+    # Create shared memory structures for synchronous communication with the
+    # vectorized environment: a channel for broadcasting target signals to
+    # all workers, action slots written by each worker, and observation ring
+    # buffers (one per worker)
+    worker_env_idxs = [tracking_env_idx, rl_env_idx, dd_mpc_env_idx]
+    target_signal = SharedTargetSignal(receiver_ids=worker_env_idxs)
+    action_slots = SharedActionSlots(
+        num_slots=env.num_envs,
+        slot_size=env.num_actions,
+        writer_ids=worker_env_idxs,
     )
-    processes.append(rl_agent_process)
-    rl_agent_process.start()
-
-    # Data-driven MPC controller
-    if verbose:
-        print("  Initializing nonlinear data-driven MPC controller")
-
-    dd_mpc_controller_process = mp.Process(
-        target=dd_mpc_controller_worker,
-        args=(
-            dd_mpc_env_idx,
-            dd_mpc_controller_init_data,
-            target_signal_queue,
-            action_queue,
-            dd_mpc_obs_queue,
-        ),
+    # Tracking observation: drone position (3) and quaternion (4)
+    tracking_obs_ring = SharedMemoryRing(payload_size=7)
+    # DD-MPC observation: drone position (3)
+    dd_mpc_obs_ring = SharedMemoryRing(payload_size=3)
+    # RL observation: raw observation buffer
+    # The RL agent observation is computed and consumed on the env device,
+    # so it is shared through a device tensor instead of host memory
+    rl_obs_channel = SharedTensorChannel(
+        payload_size=env.num_obs, device=env.device
     )
-    processes.append(dd_mpc_controller_process)
-    dd_mpc_controller_process.start()
 
-    # Step environment in the main process
-    num_processes = len(processes)
-    action_buffer = torch.zeros(
-        (env.num_envs, env.num_actions), device=env.device, dtype=torch.float
-    )
+    # Create and start controller worker processes
+    processes: list[mp.Process] = []
+    main_process_cpus: set[int] | None = None
+
+    # Ensure that the main process CPU affinity is restored, the shared
+    # memory ring buffers are released, and the workers are terminated
+    # even if the simulation is interrupted by an exception
+    try:
+        # Assign a distinct CPU core to each controller worker and restrict
+        # the main process to the remaining cores. Each worker pins itself
+        # to its core at startup, before starting any threads.
+        worker_cpus, main_process_cpus = reserve_worker_cpus(
+            len(worker_env_idxs)
+        )
+        tracking_cpu, rl_cpu, dd_mpc_cpu = worker_cpus
+
+        if verbose:
+            print("Creating parallel processes for each controller")
+
+        # Tracking controller
+        if verbose:
+            print("  Initializing tracking controller")
+
+        tracking_controller_process = mp.Process(
+            target=tracking_controller_worker,
+            args=(
+                tracking_env_idx,
+                env.device,
+                tracking_controller_init_data,
+                target_signal,
+                action_slots,
+                tracking_obs_ring,
+            ),
+            kwargs={"cpu": tracking_cpu},
+        )
+        processes.append(tracking_controller_process)
+        tracking_controller_process.start()
+
+        # RL controller (trained PPO policy)
+        if verbose:
+            print("  Initializing Reinforcement Learning controller")
+
+        env_specs = {
+            "device": env.device,
+            "step_dt": env.step_dt,
+            "num_envs": env.num_envs,
+            "num_obs": env.num_obs,
+            "num_actions": env.num_actions,
+            "max_episode_length": env.max_episode_length,
+        }
+        rl_agent_process = mp.Process(
+            target=rl_controller_worker,
+            args=(
+                rl_env_idx,
+                env_specs,
+                rl_controller_init_data,
+                target_signal,
+                action_slots,
+                rl_obs_channel,
+            ),
+            kwargs={"cpu": rl_cpu},
+        )
+        processes.append(rl_agent_process)
+        rl_agent_process.start()
+
+        # Data-driven MPC controller
+        if verbose:
+            print("  Initializing nonlinear data-driven MPC controller")
+
+        dd_mpc_controller_process = mp.Process(
+            target=dd_mpc_controller_worker,
+            args=(
+                dd_mpc_env_idx,
+                dd_mpc_controller_init_data,
+                target_signal,
+                action_slots,
+                dd_mpc_obs_ring,
+            ),
+            kwargs={"cpu": dd_mpc_cpu},
+        )
+        processes.append(dd_mpc_controller_process)
+        dd_mpc_controller_process.start()
+
+        # Step environment in the main process
+        action_buffer = torch.zeros(
+            (env.num_envs, env.num_actions),
+            device=env.device,
+            dtype=torch.float,
+        )
 
-    # Create mask for non-RL envs that require action normalization to [-1, 1]
-    non_rl_env_mask = torch.ones(action_buffer.shape[0], dtype=torch.bool)
-    non_rl_env_mask[rl_env_idx] = False
+        # Use pinned memory for non-blocking host-to-device
+        # and device-to-host copies
+        pin_memory = env.device.type == "cuda"
 
-    # Initialize control trajectory storage lists
-    normalized_action_list = []
-    drone_pos_list = []
-    target_pos_list = []
+        # Host staging buffer where worker actions are loaded before being
+        # copied to the action buffer in a single host-to-device transfer
+        action_staging = torch.zeros(
+            (env.num_envs, env.num_actions), pin_memory=pin_memory
+        )
 
-    # Start controller simulation
-    if verbose:
+        # Precompute the affine map that normalizes control actions from
+        # the env action bounds to a [-1, 1] range: y = scale * x + bias.
+        # The RL agent action is already in this range, so its env uses an
+        # identity map.
+        action_min = env_action_bounds[:, 0]
+        action_max = env_action_bounds[:, 1]
+        action_scale = (2.0 / (action_max - action_min)).repeat(
+            env.num_envs, 1
+        )
+        action_bias = (-1.0 - action_min * action_scale).repeat(
+            env.num_envs, 1
+        )
+        action_scale[rl_env_idx] = 1.0
+        action_bias[rl_env_idx] = 0.0
+        action_scale = action_scale.to(env.device)
+        action_bias = action_bias.to(env.device)
+
+        # Preallocate host buffers for the control trajectory history. If the
+        # number of simulation steps is not known beforehand (drones must
+        # stabilize at each setpoint), the buffers grow as needed.
+        num_setpoints = len(eval_setpoints)
         if steps_per_setpoint is not None:
-            print(
-                "Running data-driven position control simulation ("
-                f"{steps_per_setpoint} steps per setpoint)"
-            )
+            max_steps = num_setpoints * steps_per_setpoint
         else:
-            print(
-                "Running data-driven position control simulation ("
-                "stabilization required at each setpoint)"
-            )
+            max_steps = num_setpoints * INITIAL_HISTORY_STEPS_PER_SETPOINT
 
-    num_setpoints = len(eval_setpoints)
-    sim_info = SimInfo(num_targets=num_setpoints)
+        # Note:
+        # Actions are recorded in env action units as sent by the controllers,
+        # except for the RL agent actions, which are normalized to [-1, 1]
+        action_hist = torch.empty(
+            (max_steps, env.num_envs, env.num_actions), pin_memory=pin_memory
+        )
+        drone_pos_hist = torch.empty(
+            (max_steps, env.num_envs, 3), pin_memory=pin_memory
+        )
+        target_pos_hist = torch.empty((max_steps, 3))
+        num_steps = 0
+
+        # Freshness of each drone action (whether it was newly computed by its
+        # controller or reused from a previous step), recorded if the env is
+        # stepped asynchronously
+        action_freshness_hist = (
+            torch.zeros((max_steps, env.num_envs), dtype=torch.bool)
+            if async_stepping
+            else None
+        )
 
-    with torch.no_grad():
-        for target_idx, target_pos in enumerate(eval_setpoints):
-            if verbose:
+        # Host staging buffer for the tracking controller (position and
+        # quaternion) and DD-MPC (position) observations, filled with
+        # non-blocking copies and synchronized once per step
+        obs_staging = torch.empty(10, pin_memory=pin_memory)
+        tracking_obs_staging = obs_staging[:7]
+        dd_mpc_obs_staging = obs_staging[7:]
+
+        # Start controller simulation
+        if verbose:
+            if steps_per_setpoint is not None:
+                print(
+                    "Running data-driven position control simulation ("
+                    f"{steps_per_setpoint} steps per setpoint)"
+                )
+            else:
                 print(
-                    f"  [{target_idx + 1}/{num_setpoints}] Setting target "
-                    f"pos to: {target_pos.tolist()}"
+                    "Running data-driven position control simulation ("
+                    "stabilization required at each setpoint)"
                 )
 
-            sim_info.steps_since_target_set = 0
-            sim_info.at_target_steps = 0
-            sim_info.target_done = False
-            sim_info.current_target_idx = target_idx
-            is_new_target = True
-
-            # Update environment target position
-            update_env_target_pos(
-                env=env,
-                env_idx=list(range(env.num_envs)),
-                target_pos=target_pos,
-            )
+        sim_info = SimInfo(num_targets=num_setpoints)
+
+        # Host copies of the setpoints, transferred once before the simulation
+        eval_setpoints_cpu = [setpoint.cpu() for setpoint in eval_setpoints]
+
+        # Observation rings (or channels) indexed by
+        # the env index of their worker
+        obs_rings = {
+            tracking_env_idx: tracking_obs_ring,
+            rl_env_idx: rl_obs_channel,
+            dd_mpc_env_idx: dd_mpc_obs_ring,
+        }
+
+        # Workers waiting for a target signal (idle), workers computing a
+        # control action (busy), and workers that received the done signal
+        idle_env_idxs = list(worker_env_idxs)
+        busy_env_idxs: list[int] = []
+        done_env_idxs: list[int] = []
+
+        # Last observations sent to each worker, indexed by env index
+        obs_payloads: dict[int, torch.Tensor] = {}
+
+        # Host copy of the true drone positions used for tracking
+        # simulation progress, updated from the history every step
+        drone_pos_true = env.get_pos(add_noise=False).cpu().numpy()
+
+        with torch.no_grad():
+            for target_idx, (target_pos, target_pos_cpu) in enumerate(
+                zip(eval_setpoints, eval_setpoints_cpu, strict=True)
+            ):
+                if verbose:
+                    print(
+                        f"  [{target_idx + 1}/{num_setpoints}] Setting target "
+                        f"pos to: {target_pos_cpu.tolist()}"
+                    )
+
+                sim_info.steps_since_target_set = 0
+                sim_info.at_target_steps = 0
+                sim_info.target_done = False
+                sim_info.current_target_idx = target_idx
+                is_new_target = True
 
-            # Manage environment simulation and communication with controllers
-            while not sim_info.target_done:
-                # Update simulation progress
-                update_simulation_progress(
+                # Update environment target position
+                update_env_target_pos(
+                    env=env,
+                    env_idx=list(range(env.num_envs)),
                     target_pos=target_pos,
-                    drone_pos=env.get_pos(add_noise=False),  # True drone pos
-                    steps_per_setpoint=steps_per_setpoint,
-                    min_at_target_steps=min_at_target_steps,
-                    error_threshold=error_threshold,
-                    sim_info=sim_info,
-                    verbose=verbose,
                 )
 
-                # Store target position
-                target_pos_list.append(target_pos.cpu().numpy())
+                # Cache host views of the target position
+                target_pos_np = target_pos_cpu.numpy()
+                target_pos_row = target_pos_cpu.view(-1)
+
+                # Manage environment simulation and
+                # communication with controllers
+                while not sim_info.target_done:
+                    # Update simulation progress, computing the drone position
+                    # error only if drones must stabilize at their targets
+                    pos_error = (
+                        float(np.abs(target_pos_np - drone_pos_true).max())
+                        if steps_per_setpoint is None
+                        else 0.0
+                    )
+                    update_simulation_progress(
+                        pos_error=pos_error,
+                        steps_per_setpoint=steps_per_setpoint,
+                        min_at_target_steps=min_at_target_steps,
+                        error_threshold=error_threshold,
+                        sim_info=sim_info,
+                        verbose=verbose,
+                    )
 
-                # Send drone target position to each process
-                for _ in range(num_processes):
-                    done = not sim_info.in_progress
-                    target_signal_queue.put(
+                    # Send drone target position to the idle processes
+                    target_signal.broadcast(
                         EnvTargetSignal(
-                            target_pos=target_pos,
+                            target_pos=target_pos_cpu,
                             is_new_target=is_new_target,
-                            done=done,
+                            done=not sim_info.in_progress,
+                        ),
+                        receiver_ids=idle_env_idxs,
+                    )
+                    busy_env_idxs.extend(idle_env_idxs)
+
+                    if not sim_info.in_progress:
+                        done_env_idxs.extend(idle_env_idxs)
+
+                    is_new_target = False  # Mark target as already seen
+
+                    # Wait for the action of each busy process (or of any of
+                    # them if stepping asynchronously) and load the new
+                    # actions into the staging buffer, reusing the last
+                    # action of the others.
+                    # Note:
+                    # The first actions of all workers are always awaited,
+                    # since the staging buffer holds no valid actions before
+                    # them.
+                    if async_stepping and num_steps > 0:
+                        ready_env_idxs = action_slots.wait_any(busy_env_idxs)
+                        actions = action_slots.actions
+                        action_staging[ready_env_idxs] = actions[
+                            ready_env_idxs
+                        ]
+                    else:
+                        ready_env_idxs = busy_env_idxs
+                        action_staging.copy_(
+                            action_slots.wait_all(ready_env_idxs)
                         )
+
+                    busy_env_idxs = [
+                        env_idx
+                        for env_idx in busy_env_idxs
+                        if env_idx not in ready_env_idxs
+                    ]
+                    idle_env_idxs = ready_env_idxs
+
+                    action_buffer.copy_(action_staging, non_blocking=True)
+
+                    # Calculate env action by scaling actions
+                    # to a [-1, 1] range in place
+                    torch.addcmul(
+                        action_bias,
+                        action_buffer,
+                        action_scale,
+                        out=action_buffer,
                     )
 
-                is_new_target = False  # Mark target as already seen
+                    # Step environment using batched actions
+                    obs, _, _, _ = env.step(action_buffer)
 
-                # Get actions from action queue for each process
-                for _ in range(num_processes):
-                    env_idx, action = action_queue.get()
+                    # Store control information (using true drone position)
+                    if num_steps == action_hist.shape[0]:
+                        action_hist = grow_history_buffer(action_hist)
+                        drone_pos_hist = grow_history_buffer(drone_pos_hist)
+                        target_pos_hist = grow_history_buffer(target_pos_hist)
 
-                    # Convert action to tensor
-                    if env_idx == dd_mpc_env_idx:
-                        # Convert array to tensor
-                        action = torch.tensor(
-                            action, device=env.device
-                        ).unsqueeze(0)
-                    else:
-                        # Move action tensor to env device
-                        action = action.to(env.device).unsqueeze(0)
-
-                    # Store action in the action buffer
-                    # at its corresponding env idx
-                    action_buffer[env_idx] = action
-
-                # Calculate env action by scaling actions to
-                # a [-1, 1] range, except for the RL agent action,
-                # which is already in this range
-                action_buffer[non_rl_env_mask] = linear_interpolate(
-                    x=action_buffer[non_rl_env_mask],
-                    x_min=env_action_bounds[:, 0],
-                    x_max=env_action_bounds[:, 1],
-                    y_min=-1,
-                    y_max=1,
-                )
+                        if action_freshness_hist is not None:
+                            action_freshness_hist = grow_history_buffer(
+                                action_freshness_hist
+                            )
 
-                # Step environment using batched actions
-                obs, _, _, _ = env.step(action_buffer)
+                    action_hist[num_steps].copy_(action_staging)
+                    drone_pos_hist[num_steps].copy_(
+                        env.get_pos(add_noise=False), non_blocking=True
+                    )
+                    target_pos_hist[num_steps].copy_(target_pos_row)
+                    if action_freshness_hist is not None:
+                        action_freshness_hist[num_steps, ready_env_idxs] = True
+
+                    # Keep a host view of the stored true drone positions for
+                    # tracking simulation progress (valid after the sync below)
+                    drone_pos_true = drone_pos_hist[num_steps].numpy()
+                    num_steps += 1
+
+                    # Get noisy drone states once per step
+                    drone_pos = env.get_pos()
+                    drone_quat = env.get_quat()
+
+                    # --- Send observations to workers ---
+                    # Stage tracking and DD-MPC observations in host memory
+                    tracking_obs_staging[:3].copy_(
+                        drone_pos[tracking_env_idx], non_blocking=True
+                    )
+                    tracking_obs_staging[3:].copy_(
+                        drone_quat[tracking_env_idx], non_blocking=True
+                    )
+                    dd_mpc_obs_staging.copy_(
+                        drone_pos[dd_mpc_env_idx], non_blocking=True
+                    )
 
-                # --- Send observations to workers ---
-                drone_pos = env.get_pos()
-                drone_quat = env.get_quat()
+                    # Wait for all the non-blocking device-to-host copies
+                    if pin_memory:
+                        torch.cuda.current_stream(env.device).synchronize()
+
+                    # Send observations to the processes whose actions
+                    # were applied in this step
+                    obs_payloads = {
+                        # Drone pos/quat
+                        tracking_env_idx: tracking_obs_staging,
+                        rl_env_idx: obs[rl_env_idx],  # RL env observation
+                        dd_mpc_env_idx: dd_mpc_obs_staging,  # Drone pos
+                    }
+                    for env_idx in ready_env_idxs:
+                        obs_rings[env_idx].write(obs_payloads[env_idx])
+
+            # Let busy processes finish when stepping asynchronously,
+            # since they did not receive the done signal
+            drain_busy_workers(
+                busy_env_idxs=busy_env_idxs,
+                done_env_idxs=done_env_idxs,
+                target_signal=target_signal,
+                action_slots=action_slots,
+                obs_rings=obs_rings,
+                obs_payloads=obs_payloads,
+            )
 
-                # Send tracking controller observation
-                tracking_obs_queue.put(
-                    TrackingCtrlDroneState(
-                        drone_pos[tracking_env_idx].unsqueeze(0),
-                        drone_quat[tracking_env_idx].unsqueeze(0),
-                    )
-                )
+            # Wait for pending device-to-host copies before reading the history
+            if pin_memory:
+                torch.cuda.synchronize(env.device)
+
+            # Construct control trajectory data
+            control_trajectory_data = construct_trajectory_data(
+                env_action_bounds=env_action_bounds,
+                action_hist=action_hist,
+                rl_env_idx=rl_env_idx,
+                pos_hist=drone_pos_hist,
+                target_pos_hist=target_pos_hist,
+                num_steps=num_steps,
+                action_freshness_hist=action_freshness_hist,
+            )
+    except BaseException:
+        # Terminate the workers, which may be blocked waiting for
+        # target signals or observations from the main process
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+
+        raise
+    finally:
+        # Wait for all processes to complete
+        for p in processes:
+            p.join()
+
+        # Release shared memory ring buffers
+        for ring in (tracking_obs_ring, dd_mpc_obs_ring):
+            ring.close()
+
+        # Restore the CPU affinity of the main process
+        if main_process_cpus is not None:
+            set_process_cpu_affinity(main_process_cpus)
 
-                # Send RL environment observation
-                rl_obs_queue.put(obs[rl_env_idx])
+    return control_trajectory_data
 
-                # Send data-driven MPC controller observation
-                dd_mpc_obs = drone_pos[dd_mpc_env_idx].cpu().numpy()
-                dd_mpc_obs_queue.put(dd_mpc_obs)
 
-                # Store control information (using true drone position)
-                normalized_action_list.append(action_buffer.cpu())
+def drain_busy_workers(
+    busy_env_idxs: list[int],
+    done_env_idxs: list[int],
+    target_signal: SharedTargetSignal,
+    action_slots: SharedActionSlots,
+    obs_rings: dict[int, SharedMemoryRing | SharedTensorChannel],
+    obs_payloads: dict[int, torch.Tensor],
+) -> None:
+    """
+    Let busy controller workers terminate after the simulation ends.
 
-                drone_pos_true = env.get_pos(add_noise=False).cpu().numpy()
-                drone_pos_list.append(drone_pos_true)
+    Busy workers (computing a control action) may not have received the done
+    signal if the environment was stepped asynchronously. Each busy worker
+    is sent its last observation, followed by a done signal if it didn't
+    receive one already, until all workers terminate. The actions sent by
+    the workers are discarded.
 
-        # Construct control trajectory data
-        control_trajectory_data = construct_trajectory_data(
-            env_action_bounds=env_action_bounds,
-            normalized_action_list=normalized_action_list,
-            drone_pos_list=drone_pos_list,
-            target_pos_list=target_pos_list,
-        )
+    Args:
+        busy_env_idxs (list[int]): The env indices of the busy workers.
+        done_env_idxs (list[int]): The env indices of the workers that
+            already received the done signal.
+        target_signal (SharedTargetSignal): The target signal channel.
+        action_slots (SharedActionSlots): The action slots of the workers.
+        obs_rings (dict[int, SharedMemoryRing | SharedTensorChannel]): The
+            observation rings (or channels) of the workers, indexed by env
+            index.
+        obs_payloads (dict[int, torch.Tensor]): The last observations of the
+            workers, indexed by env index.
+    """
+    done_signal = EnvTargetSignal(
+        target_pos=torch.zeros(3), is_new_target=False, done=True
+    )
 
-    # Wait for all processes to complete
-    for p in processes:
-        p.join()
+    while busy_env_idxs:
+        # Send the last observation to the workers that sent an action
+        ready_env_idxs = action_slots.wait_any(busy_env_idxs)
+        for env_idx in ready_env_idxs:
+            obs_rings[env_idx].write(obs_payloads[env_idx])
+
+        busy_env_idxs = [
+            env_idx
+            for env_idx in busy_env_idxs
+            if env_idx not in ready_env_idxs
+        ]
+
+        # Send the done signal to the workers that didn't receive it
+        pending_done_env_idxs = [
+            env_idx
+            for env_idx in ready_env_idxs
+            if env_idx not in done_env_idxs
+        ]
+        if pending_done_env_idxs:
+            target_signal.broadcast(
+                done_signal, receiver_ids=pending_done_env_idxs
+            )
+            done_env_idxs = done_env_idxs + pending_done_env_idxs
+            busy_env_idxs.extend(pending_done_env_idxs)
 
-    return control_trajectory_data
+
+def grow_history_buffer(buffer: torch.Tensor) -> torch.Tensor:
+    """
+    Return a copy of a history buffer with twice its length along the first
+    (step) dimension, where the new entries are zero-initialized.
+
+    Args:
+        buffer (torch.Tensor): The history buffer to grow.
+
+    Returns:
+        torch.Tensor: The grown history buffer. It is pinned if the original
+            buffer is pinned.
+    """
+    pin_memory = buffer.is_pinned()
+    if pin_memory:
+        # Wait for pending non-blocking copies into the buffer
+        torch.cuda.synchronize()
+
+    grown_buffer = torch.zeros(
+        (2 * buffer.shape[0], *buffer.shape[1:]),
+        dtype=buffer.dtype,
+        pin_memory=pin_memory,
+    )
+    grown_buffer[: buffer.shape[0]].copy_(buffer)
+
+    return grown_buffer
 
 
 def update_simulation_progress(
-    target_pos: torch.Tensor,
-    drone_pos: torch.Tensor,
+    pos_error: float,
     steps_per_setpoint: int | None,
     min_at_target_steps: int,
     error_threshold: float,
@@ -381,7 +684,6 @@ def update_simulation_progress(
     else:
         # Change targets only when drone stabilize at them
         # Update the duration of drones hovering close to its target
-        pos_error = torch.abs(target_pos - drone_pos).max().item()
         if pos_error < error_threshold:
             sim_info.at_target_steps += 1
 
@@ -404,40 +706,59 @@ def update_simulation_progress(
 
 def construct_trajectory_data(
     env_action_bounds: torch.Tensor,
-    normalized_action_list: list[torch.Tensor],
-    drone_pos_list: list[np.ndarray],
-    target_pos_list: list[np.ndarray],
+    action_hist: torch.Tensor,
+    rl_env_idx: int,
+    pos_hist: torch.Tensor,
+    target_pos_hist: torch.Tensor,
+    num_steps: int,
+    action_freshness_hist: torch.Tensor | None = None,
 ) -> ControlTrajectory:
-    # Construct control input array from normalized action list
-    control_input_tensor = torch.stack(normalized_action_list, dim=0).cpu()
-    # Clamp inputs to [-1, 1] since actions are clipped within the env
-    control_input_tensor = control_input_tensor.clamp(-1, 1)
-    # Inverse normalize inputs from [-1, 1] to the true control input range
-    control_input_tensor = linear_interpolate(
-        x=control_input_tensor,
-        x_min=-1,
-        x_max=1,
-        y_min=env_action_bounds[:, 0].cpu(),
-        y_max=env_action_bounds[:, 1].cpu(),
+    # Note:
+    # The history buffers are modified in place and the returned
+    # trajectory arrays are views of them to avoid copies
+
+    control_input_array = action_hist[:num_steps].numpy()
+    action_bounds = env_action_bounds.cpu().numpy()
+    action_min = action_bounds[:, 0]
+    action_max = action_bounds[:, 1]
+
+    # Inverse normalize RL agent inputs from [-1, 1] to the true control
+    # input range, as the other controllers already use env action units
+    rl_control_inputs = control_input_array[:, rl_env_idx]
+    rl_control_inputs *= (action_max - action_min) / 2
+    rl_control_inputs += (action_max + action_min) / 2
+
+    # Clamp inputs to the env action bounds since actions are clipped
+    # within the env
+    np.clip(
+        control_input_array, action_min, action_max, out=control_input_array
     )
-    control_input_array = control_input_tensor.numpy()
     control_input_array = control_input_array.transpose(1, 0, 2)
     control_inputs_list = [
         control_input_array[i] for i in range(control_input_array.shape[0])
     ]
 
     # Construct system output array (drone position)
-    system_output_array = np.stack(drone_pos_list, axis=0)
-    system_output_array = system_output_array.transpose(1, 0, 2)
+    system_output_array = pos_hist[:num_steps].numpy().transpose(1, 0, 2)
     system_outputs_list = [
         system_output_array[i] for i in range(system_output_array.shape[0])
     ]
 
     # Construct setpoint array (target position)
-    setpoint_array = np.vstack(target_pos_list)
+    setpoint_array = target_pos_hist[:num_steps].numpy()
+
+    # Construct action freshness array, if recorded
+    action_freshness_list = None
+    if action_freshness_hist is not None:
+        action_freshness_array = action_freshness_hist[:num_steps].numpy().T
+        action_freshness_list = [
+            action_freshness_array[i]
+            for i in range(action_freshness_array.shape[0])
+        ]
 
     return ControlTrajectory(
         control_inputs=control_inputs_list,
         system_outputs=system_outputs_list,
         system_setpoint=setpoint_array,
+        action_freshness=action_freshness_list,
     )
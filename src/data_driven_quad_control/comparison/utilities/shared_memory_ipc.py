@@ -0,0 +1,501 @@
+"""
+Shared-memory communication primitives for parallel controller workers.
+
+This module implements the transport used by the main simulation process and
+the controller workers to exchange target signals, observations, and control
+actions. Payloads are copied in place into pre-allocated shared memory
+tensors (on the host or, for device-resident payloads, on a CUDA device),
+avoiding the pickling and pipe copies performed by `multiprocessing.Queue`
+messages on every simulation step.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from .controller_comparison_config import EnvTargetSignal
+
+# Ring header layout: the producer (head) and consumer (tail) indices are
+# placed on distinct cache lines, and the payload slots start on the next
+# cache line, to prevent false sharing between processes
+CACHE_LINE_SIZE = 64
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = CACHE_LINE_SIZE
+_HEADER_SIZE = 2 * CACHE_LINE_SIZE
+
+
+class SharedMemoryRing:
+    """
+    A single-producer single-consumer (SPSC) ring buffer of fixed-size
+    payloads stored in shared memory.
+
+    The ring is backed by a `SharedMemory` block laid out as:
+
+        [head index | pad][tail index | pad][slot 0][slot 1]...
+
+    Each index occupies its own 64-byte cache line, and the payload slots
+    start on a separate cache line. Each side of the ring only writes to its
+    own index: the producer publishes the head on every write and the
+    consumer publishes the tail on every read. Both sides also keep a private
+    copy of their own index, so they never read back the shared one. This
+    prevents the producer and consumer CPUs from bouncing the same cache line
+    at every environment step.
+
+    Payloads are copied in place into the ring slots, so no data is
+    serialized between processes. Semaphores are used to wake up the other
+    side when slots are filled or freed, and the shared indices back the
+    number of unread payloads (`len(ring)`).
+
+    Note:
+        The process that creates the ring owns its shared memory block and
+        unlinks it when the ring is closed. Copies of the ring sent to other
+        processes only attach to the existing block.
+    """
+
+    def __init__(
+        self,
+        payload_size: int,
+        capacity: int = 2,
+        dtype: torch.dtype = torch.float,
+    ):
+        """
+        Initialize a shared memory ring buffer.
+
+        Args:
+            payload_size (int): The number of elements of each payload.
+            capacity (int): The number of slots of the ring. Defaults to 2.
+            dtype (torch.dtype): The data type of the payloads. Defaults to
+                `torch.float`.
+        """
+        self.payload_size = payload_size
+        self.capacity = capacity
+        self.dtype = dtype
+
+        # Allocate the shared memory block (header + ring slots)
+        payload_bytes = payload_size * torch.empty((), dtype=dtype).itemsize
+        self._shm = SharedMemory(
+            create=True, size=_HEADER_SIZE + payload_bytes * capacity
+        )
+        self._is_owner = True
+        self._closed = False
+        self._attach_views()
+        self._head[0] = 0
+        self._tail[0] = 0
+
+        # Private copies of the producer (head) and consumer (tail) indices
+        self._local_head = 0
+        self._local_tail = 0
+
+        # Wake-up semaphores for filled and free slots
+        self._filled = mp.Semaphore(0)
+        self._free = mp.Semaphore(capacity)
+
+    def _attach_views(self) -> None:
+        """Create the index and slot views of the shared memory block."""
+        buf = self._shm.buf
+        self._head = np.frombuffer(
+            buf, dtype=np.uint64, count=1, offset=_HEAD_OFFSET
+        )
+        self._tail = np.frombuffer(
+            buf, dtype=np.uint64, count=1, offset=_TAIL_OFFSET
+        )
+        self.buffer = torch.frombuffer(
+            buf,
+            dtype=self.dtype,
+            count=self.capacity * self.payload_size,
+            offset=_HEADER_SIZE,
+        ).view(self.capacity, self.payload_size)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Views of the shared memory block can't be pickled. The
+        # receiving process reattaches them to the block by name.
+        state = self.__dict__.copy()
+        del state["_head"], state["_tail"], state["buffer"]
+        state["_is_owner"] = False
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._attach_views()
+
+    def __len__(self) -> int:
+        """Return the number of unread payloads in the ring."""
+        return int(self._head[0]) - int(self._tail[0])
+
+    def write(self, *parts: torch.Tensor | np.ndarray) -> None:
+        """
+        Write a payload into the next free slot of the ring, blocking until a
+        slot is available.
+
+        The payload is built by copying each part, flattened, into
+        consecutive segments of the slot.
+
+        Args:
+            *parts (torch.Tensor | np.ndarray): The payload parts. Their total
+                number of elements must be equal to `payload_size`.
+        """
+        self._free.acquire()
+
+        slot = self.buffer[self._local_head % self.capacity]
+
+        offset = 0
+        for part in parts:
+            part_tensor = torch.as_tensor(part).reshape(-1)
+            part_size = part_tensor.numel()
+            slot[offset : offset + part_size].copy_(part_tensor)
+            offset += part_size
+
+        # Publish the producer index only
+        self._local_head += 1
+        self._head[0] = self._local_head
+        self._filled.release()
+
+    def read_into(self, dst: torch.Tensor) -> torch.Tensor:
+        """
+        Read the oldest unread payload of the ring into `dst`, blocking until
+        a payload is available.
+
+        Args:
+            dst (torch.Tensor): The destination tensor with `payload_size`
+                elements.
+
+        Returns:
+            torch.Tensor: The destination tensor `dst`.
+        """
+        self._filled.acquire()
+
+        slot = self.buffer[self._local_tail % self.capacity]
+        dst.copy_(slot.reshape(dst.shape))
+
+        # Publish the consumer index only
+        self._local_tail += 1
+        self._tail[0] = self._local_tail
+        self._free.release()
+
+        return dst
+
+    def close(self) -> None:
+        """
+        Release the views of the shared memory block and close it. If called
+        from the process that created the ring, the block is also unlinked.
+        """
+        if self._closed:
+            return
+
+        # Views must be released before closing the shared memory block
+        del self._head, self._tail, self.buffer
+        self._shm.close()
+
+        if self._is_owner:
+            self._shm.unlink()
+
+        self._closed = True
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self.close()
+
+
+class SharedTensorChannel:
+    """
+    A single-producer single-consumer (SPSC) channel of fixed-size payloads
+    stored in a shared tensor that may reside on a CUDA device.
+
+    The channel tensor is shared with the processes it is sent to: CPU
+    tensors are moved to shared memory, while CUDA tensors are shared through
+    CUDA IPC handles by `torch.multiprocessing`. This way, payloads that are
+    produced and consumed on the same device are exchanged with a
+    device-to-device copy, without transfers through host memory.
+
+    Like `SharedMemoryRing`, the channel holds `capacity` payload slots used
+    in a circular order. Each side tracks its own slot index privately, and
+    semaphores are used to wake up the other side when slots are filled or
+    freed.
+
+    Note:
+        The process that creates the channel must keep it alive while other
+        processes use it, as required for sharing CUDA tensors.
+    """
+
+    def __init__(
+        self,
+        payload_size: int,
+        capacity: int = 2,
+        device: torch.device | str = "cpu",
+        dtype: torch.dtype = torch.float,
+    ):
+        """
+        Initialize a shared tensor channel.
+
+        Args:
+            payload_size (int): The number of elements of each payload.
+            capacity (int): The number of slots of the channel. Defaults to 2.
+            device (torch.device | str): The device of the channel tensor.
+                Defaults to "cpu".
+            dtype (torch.dtype): The data type of the payloads. Defaults to
+                `torch.float`.
+        """
+        self.payload_size = payload_size
+        self.capacity = capacity
+        self.buffer = torch.zeros(
+            (capacity, payload_size), dtype=dtype, device=device
+        ).share_memory_()
+
+        # Private producer (head) and consumer (tail) slot indices
+        self._local_head = 0
+        self._local_tail = 0
+
+        # Wake-up semaphores for filled and free slots
+        self._filled = mp.Semaphore(0)
+        self._free = mp.Semaphore(capacity)
+
+    def _synchronize(self) -> None:
+        """Wait for pending copies to or from a CUDA channel tensor."""
+        if self.buffer.is_cuda:
+            torch.cuda.current_stream(self.buffer.device).synchronize()
+
+    def write(self, payload: torch.Tensor) -> None:
+        """
+        Write a payload into the next free slot of the channel, blocking
+        until a slot is available.
+
+        Args:
+            payload (torch.Tensor): The payload, with `payload_size`
+                elements.
+        """
+        self._free.acquire()
+
+        slot = self.buffer[self._local_head % self.capacity]
+        slot.copy_(payload.reshape(-1))
+        self._synchronize()
+
+        self._local_head += 1
+        self._filled.release()
+
+    def read_into(self, dst: torch.Tensor) -> torch.Tensor:
+        """
+        Read the oldest unread payload of the channel into `dst`, blocking
+        until a payload is available.
+
+        Args:
+            dst (torch.Tensor): The destination tensor with `payload_size`
+                elements.
+
+        Returns:
+            torch.Tensor: The destination tensor `dst`.
+        """
+        self._filled.acquire()
+
+        slot = self.buffer[self._local_tail % self.capacity]
+        dst.copy_(slot.reshape(dst.shape))
+        self._synchronize()
+
+        self._local_tail += 1
+        self._free.release()
+
+        return dst
+
+
+class SharedTargetSignal:
+    """
+    A broadcast channel of `EnvTargetSignal` values from the main process to
+    multiple controller workers.
+
+    Target signals are written into shared memory tensors with one row per
+    receiver, and each receiver is woken up through its own semaphore, so the
+    signal is never serialized. Target updates are tracked with a target
+    generation counter, allowing receivers to detect new targets even if they
+    missed the signal that introduced them (e.g., when only a subset of
+    receivers is signaled).
+
+    Note:
+        Each receiver row holds a single signal. A new signal must only be
+        sent to a receiver after it has read the previous one, which is
+        guaranteed by the simulation loop, since workers only send their
+        control actions after reading the target signal.
+    """
+
+    def __init__(self, receiver_ids: list[int]):
+        """
+        Initialize a shared target signal channel.
+
+        Args:
+            receiver_ids (list[int]): The IDs of the receivers of the signal
+                (e.g., the env indices of the controller workers).
+        """
+        num_receivers = len(receiver_ids)
+        self._receiver_rows = {
+            receiver_id: row for row, receiver_id in enumerate(receiver_ids)
+        }
+
+        # Target positions and [target generation, done] flags per receiver
+        self.target_pos = torch.zeros((num_receivers, 3)).share_memory_()
+        self.state = torch.zeros(
+            (num_receivers, 2), dtype=torch.long
+        ).share_memory_()
+
+        # Semaphores used to signal new target signals to each receiver
+        self._ready = {
+            receiver_id: mp.Semaphore(0) for receiver_id in receiver_ids
+        }
+
+        # Target generation of the sender and last generation seen by each
+        # receiver (each process only updates its own copy)
+        self._target_generation = 0
+        self._seen_target_generations = dict.fromkeys(receiver_ids, 0)
+
+    def broadcast(
+        self,
+        target_signal: EnvTargetSignal,
+        receiver_ids: list[int] | None = None,
+    ) -> None:
+        """
+        Write a target signal into shared memory and notify its receivers.
+
+        Args:
+            target_signal (EnvTargetSignal): The target signal.
+            receiver_ids (list[int] | None): The IDs of the receivers to
+                signal. If `None`, all receivers are signaled. Defaults to
+                `None`.
+        """
+        if target_signal.is_new_target:
+            self._target_generation += 1
+
+        if receiver_ids is None:
+            receiver_ids = list(self._receiver_rows)
+
+        for receiver_id in receiver_ids:
+            row = self._receiver_rows[receiver_id]
+            self.target_pos[row].copy_(target_signal.target_pos.reshape(-1))
+            self.state[row, 0] = self._target_generation
+            self.state[row, 1] = target_signal.done
+
+            self._ready[receiver_id].release()
+
+    def receive(self, receiver_id: int) -> EnvTargetSignal:
+        """
+        Read the target signal of a receiver, blocking until a new signal is
+        sent to it.
+
+        Args:
+            receiver_id (int): The ID of the receiver.
+
+        Returns:
+            EnvTargetSignal: The target signal, with its target position as a
+                `(1, 3)` CPU tensor.
+        """
+        self._ready[receiver_id].acquire()
+
+        row = self._receiver_rows[receiver_id]
+        target_generation = int(self.state[row, 0])
+        is_new_target = (
+            target_generation != self._seen_target_generations[receiver_id]
+        )
+        self._seen_target_generations[receiver_id] = target_generation
+
+        return EnvTargetSignal(
+            target_pos=self.target_pos[row].clone().unsqueeze(0),
+            is_new_target=is_new_target,
+            done=bool(self.state[row, 1]),
+        )
+
+
+class SharedActionSlots:
+    """
+    A structure-of-arrays (SoA) layout of control action slots in shared
+    memory, with one slot (row) per environment.
+
+    Each worker writes its control action into the slot of its environment
+    and signals it through its own semaphore. The main process waits for all
+    the workers and then reads every action at once from a single shared
+    memory tensor.
+
+    Note:
+        A worker must only write a new action after the main process has
+        read the previous one, which is guaranteed by the simulation loop,
+        since workers wait for their observations after sending their
+        control actions.
+    """
+
+    def __init__(self, num_slots: int, slot_size: int, writer_ids: list[int]):
+        """
+        Initialize shared action slots.
+
+        Args:
+            num_slots (int): The number of action slots (e.g., the number of
+                environments).
+            slot_size (int): The number of elements of each action.
+            writer_ids (list[int]): The slot indices written by the workers
+                (e.g., the env indices of the controller workers).
+        """
+        self.actions = torch.zeros((num_slots, slot_size)).share_memory_()
+
+        # Semaphores used to signal written actions for each slot,
+        # and a counter of written actions from any slot
+        self._ready = {writer_id: mp.Semaphore(0) for writer_id in writer_ids}
+        self._any_ready = mp.Semaphore(0)
+
+    def write(self, writer_id: int, action: torch.Tensor | np.ndarray) -> None:
+        """
+        Write a control action into a slot and signal it as ready.
+
+        Args:
+            writer_id (int): The slot index of the writer.
+            action (torch.Tensor | np.ndarray): The control action.
+        """
+        self.actions[writer_id].copy_(torch.as_tensor(action).reshape(-1))
+        self._ready[writer_id].release()
+        self._any_ready.release()
+
+    def wait_all(self, writer_ids: list[int] | None = None) -> torch.Tensor:
+        """
+        Wait until every writer has written its control action.
+
+        Args:
+            writer_ids (list[int] | None): The slot indices of the writers to
+                wait for. If `None`, all writers are waited for. Defaults to
+                `None`.
+
+        Returns:
+            torch.Tensor: The shared tensor containing all action slots.
+        """
+        if writer_ids is None:
+            writer_ids = list(self._ready)
+
+        for writer_id in writer_ids:
+            self._ready[writer_id].acquire()
+            self._any_ready.acquire()
+
+        return self.actions
+
+    def wait_any(self, writer_ids: list[int]) -> list[int]:
+        """
+        Wait until at least one writer has written its control action.
+
+        Args:
+            writer_ids (list[int]): The slot indices of the writers to wait
+                for. Only these writers must have pending actions.
+
+        Returns:
+            list[int]: The slot indices of the writers whose actions were
+                written.
+        """
+        # Block until any action is written
+        self._any_ready.acquire()
+
+        # Collect every written action without blocking. Each action is
+        # counted once in `_any_ready`, so the count is decreased for the
+        # additional actions collected.
+        ready_writer_ids = [
+            writer_id
+            for writer_id in writer_ids
+            if self._ready[writer_id].acquire(block=False)
+        ]
+        for _ in range(len(ready_writer_ids) - 1):
+            self._any_ready.acquire()
+
+        return ready_writer_ids
@@ -1,4 +1,3 @@
-from functools import partial
 from typing import Optional
 
 import numpy as np
@@ -8,41 +7,79 @@ from direct_data_driven_mpc.utilities.models.nonlinear_model import (
 )
 
 from data_driven_quad_control.envs.hover_env import HoverEnv
-from data_driven_quad_control.utilities.math_utils import linear_interpolate
-
-
-def drone_dynamics(
-    x: np.ndarray,
-    u: np.ndarray,
-    env: HoverEnv,
-    env_action_bounds: torch.Tensor,
-    env_idx: int,
-) -> np.ndarray:
-    action = u  # Note: action is within `env_action_bounds` range
-
-    # Convert action to tensor
-    action_tensor = torch.tensor(
-        action, dtype=torch.float, device=env.device
-    ).unsqueeze(0)
-
-    # Normalize action to a [-1, 1] range
-    env_action = linear_interpolate(
-        x=action_tensor,
-        x_min=env_action_bounds[:, 0],
-        x_max=env_action_bounds[:, 1],
-        y_min=-1,
-        y_max=1,
-    )
 
-    # Step simulation
-    env.step(env_action)
 
-    # Get system state from environment
-    # We assume the state to be the base position, omitting other variables
-    # since we only require input-output data for controlling the drone
-    state = env.get_pos()[env_idx].cpu().numpy()
+class DroneDynamics:
+    """
+    Drone system dynamics function that steps a drone in a vectorized
+    environment.
+
+    The action and state buffers used in each call, and the affine map that
+    normalizes actions to the env action range, are pre-allocated once so
+    that calls don't allocate new tensors.
+    """
+
+    def __init__(self, env: HoverEnv, env_idx: int):
+        """
+        Initialize the drone system dynamics.
+
+        Args:
+            env (HoverEnv): The vectorized drone environment.
+            env_idx (int): The index of the drone in the environment.
+        """
+        self.env = env
+        self.env_idx = env_idx
+
+        # Precompute the scale and bias that normalize actions from
+        # `env_action_bounds` to a [-1, 1] range
+        env_action_bounds = env.action_bounds
+        action_min = env_action_bounds[:, 0]
+        action_max = env_action_bounds[:, 1]
+        self.action_scale = (2.0 / (action_max - action_min)).to(env.device)
+        self.action_bias = (-1.0 - action_min * self.action_scale).to(
+            env.device
+        )
 
-    return state
+        # Pre-allocate action and state buffers reused by every call,
+        # using pinned host buffers for asynchronous host-device transfers
+        m = env_action_bounds.shape[0]
+        pin_memory = env.device.type == "cuda"
+        self.action_staging = torch.empty((1, m), pin_memory=pin_memory)
+        self.action_buffer = torch.empty((1, m), device=env.device)
+        self.state_staging = torch.empty(3, pin_memory=pin_memory)
+        self._action_staging_np = self.action_staging.numpy()
+        self._state_staging_np = self.state_staging.numpy()
+
+    def __call__(self, x: np.ndarray, u: np.ndarray) -> np.ndarray:
+        action = u  # Note: action is within `env_action_bounds` range
+
+        # Load action into the preallocated device buffer
+        self._action_staging_np[0] = action
+        self.action_buffer.copy_(self.action_staging, non_blocking=True)
+
+        # Normalize action to a [-1, 1] range
+        torch.addcmul(
+            self.action_bias,
+            self.action_buffer,
+            self.action_scale,
+            out=self.action_buffer,
+        )
+
+        # Step simulation
+        self.env.step(self.action_buffer)
+
+        # Get system state from environment
+        # We assume the state to be the base position, omitting other
+        # variables since we only require input-output data for controlling
+        # the drone
+        self.state_staging.copy_(
+            self.env.get_pos()[self.env_idx], non_blocking=True
+        )
+        if self.action_buffer.is_cuda:
+            torch.cuda.current_stream(self.env.device).synchronize()
+
+        # Return a copy, since the staging buffer is reused across calls
+        return self._state_staging_np.copy()
 
 
 def drone_output(x: np.ndarray, u: np.ndarray) -> np.ndarray:
@@ -52,26 +89,18 @@ def drone_output(x: np.ndarray, u: np.ndarray) -> np.ndarray:
 def create_system_model(
     env: HoverEnv, env_idx: int, initial_state: Optional[np.ndarray] = None
 ) -> NonlinearSystem:
-    # Retrieve env action bounds from env
-    env_action_bounds = env.action_bounds
-
     # Define drone system dynamics function
-    drone_dynamics_pre_bound = partial(
-        drone_dynamics,
-        env=env,
-        env_action_bounds=env_action_bounds,
-        env_idx=env_idx,
-    )
+    drone_dynamics = DroneDynamics(env=env, env_idx=env_idx)
 
     # Define system model (simulation)
     n = 3  # Number of system states (only necessary for storage
     # since the simulation is handled by the env)
 
-    m = env_action_bounds.shape[0]  # Number of control inputs
+    m = env.action_bounds.shape[0]  # Number of control inputs
     p = 3  # Number of system outputs
     eps_max = 0.0  # Upper bound of the system measurement noise
     system_model = NonlinearSystem(
-        f=drone_dynamics_pre_bound,
+        f=drone_dynamics,
         h=drone_output,
         n=n,
         m=m,
@@ -106,10 +135,11 @@ def drone_tracking_callback(
 
     # Stop simulation by raising a ValueError if the distance from the drone
     # to its setpoint position is greater than the initial distance
-    current_drone_pos = np.array(system_model.x[:3]).reshape(-1, 1)
-    current_distance = np.linalg.norm(current_drone_pos - y_r)
-    if current_distance - initial_distance > distance_threshold:
+    # Note: Squared distances are compared to avoid computing a square root
+    pos_error = system_model.x[:3] - y_r.ravel()
+    max_distance = initial_distance + distance_threshold
+    if pos_error @ pos_error > max_distance * max_distance:
         raise ValueError(
-            f"Drone Drone moved away from its goal by {distance_threshold} "
+            f"Drone moved away from its goal by {distance_threshold} "
             "from its starting position."
         )
@@ -33,6 +33,10 @@
 #     recording.
 #   - Added a parameter (`camera_config`) to configure camera resolution,
 #     position, look-at target, and FOV.
+#   - Moved the post-physics state updates and termination checks to a
+#     function (`compute_post_physics_state`), compiled along with the reward
+#     computation (`compute_rewards`) on CUDA devices to fuse small kernels
+#     (configurable with `env_cfg["torch_compile"]`).
 
 import math
 from typing import Any
@@ -44,7 +48,6 @@ from genesis.engine.entities.rigid_entity import RigidEntity
 from genesis.utils.geom import (
     inv_quat,
     quat_to_xyz,
-    transform_by_quat,
     transform_quat_by_quat,
 )
 
@@ -52,8 +55,7 @@ from data_driven_quad_control.controllers.ctbr.ctbr_controller import (
     DroneCTBRController,
 )
 from data_driven_quad_control.utilities.math_utils import (
-    gs_rand_float,
-    linear_interpolate,
+    rotate_vectors_by_quaternion,
 )
 
 from .hover_env_config import (
@@ -65,6 +67,71 @@ from .hover_env_config import (
 )
 
 
+def compute_post_physics_state(
+    base_pos: torch.Tensor,
+    last_base_pos: torch.Tensor,
+    base_quat: torch.Tensor,
+    inv_base_init_quat: torch.Tensor,
+    commands: torch.Tensor,
+    world_lin_vel: torch.Tensor,
+    world_ang_vel: torch.Tensor,
+    squared_termination_thresholds: torch.Tensor,
+    min_base_height: float,
+) -> tuple[
+    torch.Tensor,
+    torch.Tensor,
+    torch.Tensor,
+    torch.Tensor,
+    torch.Tensor,
+    torch.Tensor,
+]:
+    """
+    Compute the drone state derived after physics stepping and its crash
+    condition.
+
+    Returns:
+        tuple[torch.Tensor, ...]: The relative positions to the targets for
+            the current and last positions, the base Euler angles (in
+            degrees), the base linear and angular velocities in the body
+            frame, and the crash condition mask.
+    """
+    rel_pos = commands - base_pos
+    last_rel_pos = commands - last_base_pos
+    base_euler = quat_to_xyz(
+        transform_quat_by_quat(
+            inv_base_init_quat.expand_as(base_quat), base_quat
+        ),
+        rpy=True,
+        degrees=True,
+    )
+
+    # Rotate the linear and angular velocities to the body frame at once
+    inv_base_quat = inv_quat(base_quat)
+    base_vels = rotate_vectors_by_quaternion(
+        torch.stack([world_lin_vel, world_ang_vel], dim=1),
+        inv_base_quat.unsqueeze(1),
+    )
+    base_lin_vel, base_ang_vel = base_vels.unbind(dim=1)
+
+    # Check all absolute value limits in a single reduction, comparing
+    # squared values against squared thresholds
+    crash_condition = (
+        torch.cat(
+            [base_euler[:, :2], rel_pos, base_ang_vel, base_lin_vel], dim=1
+        ).square()
+        > squared_termination_thresholds
+    ).any(dim=1) | (base_pos[:, 2] < min_base_height)
+
+    return (
+        rel_pos,
+        last_rel_pos,
+        base_euler,
+        base_lin_vel,
+        base_ang_vel,
+        crash_condition,
+    )
+
+
 class HoverEnv:
     def __init__(
         self,
@@ -117,31 +184,20 @@ class HoverEnv:
 
         # Define action bounds for inverse normalization of actions
         if self.uses_ctbr_actions:
-            # Construct thrust bounds tensor
-            thrust_bounds = torch.tensor(
-                [[0, EnvActionBounds.MAX_THRUST]],
-                dtype=torch.float,
-                device=self.device,
-            )
-
-            # Construct angular velocity bounds tensor
-            max_ang_vels = torch.tensor(
-                EnvActionBounds.MAX_ANG_VELS,
-                dtype=torch.float,
-                device=self.device,
-            )
-
-            # Remove yaw angular velocity bound
-            # if the action type is CTBR_FIXED_YAW
+            # Angular velocity bounds, removing the yaw angular
+            # velocity bound if the action type is CTBR_FIXED_YAW
+            max_ang_vels = EnvActionBounds.MAX_ANG_VELS
             if self.action_type == EnvActionType.CTBR_FIXED_YAW:
                 max_ang_vels = max_ang_vels[:-1]
 
-            ang_vel_bounds = torch.hstack(
-                [-max_ang_vels.view(-1, 1), max_ang_vels.view(-1, 1)]
+            # Construct CTBR action bounds tensor from the thrust
+            # and angular velocity bounds in a single allocation
+            self.action_bounds = torch.tensor(
+                [[0.0, EnvActionBounds.MAX_THRUST]]
+                + [[-w, w] for w in max_ang_vels],
+                dtype=torch.float,
+                device=self.device,
             )
-
-            # Construct CTBR action bounds tensor
-            self.action_bounds = torch.vstack([thrust_bounds, ang_vel_bounds])
         else:
             # Construct rotor RPM action bounds tensor
             self.action_bounds = torch.tensor(
@@ -150,6 +206,15 @@ class HoverEnv:
                 device=self.device,
             )
 
+        # Precompute the affine map that inverse normalizes actions from a
+        # [-1, 1] range to the action bounds: y = scale * x + offset
+        self.action_scale = (
+            self.action_bounds[:, 1] - self.action_bounds[:, 0]
+        ) / 2
+        self.action_offset = (
+            self.action_bounds[:, 1] + self.action_bounds[:, 0]
+        ) / 2
+
         self.num_commands = command_cfg["num_commands"]
 
         self.simulate_action_latency = env_cfg["simulate_action_latency"]
@@ -163,6 +228,12 @@ class HoverEnv:
         self.command_cfg: dict[str, tuple[float, float]] = command_cfg
 
         self.obs_scales = obs_cfg["obs_scales"]
+
+        # Observation buffer dtype. Lower precision types (e.g., bfloat16)
+        # reduce the memory traffic of observations, but cannot resolve
+        # small observation noise levels and require a policy that accepts
+        # them, so full precision is kept by default.
+        self.obs_dtype: torch.dtype = obs_cfg.get("obs_dtype", gs.tc_float)
         self.reward_scales = reward_cfg["reward_scales"]
 
         # Retrieve camera configuration
@@ -242,20 +313,39 @@ class HoverEnv:
         self.scene.build(n_envs=num_envs, env_spacing=(0.4, 0.4))
 
         # prepare reward functions and multiply reward scales by dt
+        # Episode reward sums are stored as rows of a single buffer
+        self.episode_sums_buf = torch.zeros(
+            (len(self.reward_scales), self.num_envs),
+            device=self.device,
+            dtype=gs.tc_float,
+        )
         self.reward_functions, self.episode_sums = {}, {}
-        for name in self.reward_scales.keys():
+        for i, name in enumerate(self.reward_scales.keys()):
             self.reward_scales[name] *= self.step_dt
             self.reward_functions[name] = getattr(self, "_reward_" + name)
-            self.episode_sums[name] = torch.zeros(
-                (self.num_envs,), device=self.device, dtype=gs.tc_float
-            )
+            self.episode_sums[name] = self.episode_sums_buf[i]
+
+        # Reward scales as a column vector to scale stacked rewards at once
+        self.reward_scales_buf = torch.tensor(
+            list(self.reward_scales.values()),
+            device=self.device,
+            dtype=gs.tc_float,
+        ).unsqueeze(1)
 
         # initialize buffers
+        self.all_envs_idx = torch.arange(
+            self.num_envs, device=self.device, dtype=torch.long
+        )
         self.obs_buf = torch.zeros(
             (self.num_envs, self.num_obs),
             device=self.device,
-            dtype=gs.tc_float,
+            dtype=self.obs_dtype,
         )
+
+        # Scratch buffer where observations are assembled in place before
+        # being copied into the fresh tensor returned by each step, since
+        # rollout storages keep references to previous observations
+        self.obs_scratch_buf = torch.zeros_like(self.obs_buf)
         self.rew_buf = torch.zeros(
             (self.num_envs,), device=self.device, dtype=gs.tc_float
         )
@@ -271,6 +361,19 @@ class HoverEnv:
             dtype=gs.tc_float,
         )
 
+        # Lower bounds and spans of the x, y, z target position commands
+        command_ranges = torch.tensor(
+            [
+                self.command_cfg["pos_x_range"],
+                self.command_cfg["pos_y_range"],
+                self.command_cfg["pos_z_range"],
+            ],
+            device=self.device,
+            dtype=gs.tc_float,
+        )
+        self.command_lower = command_ranges[:, 0]
+        self.command_span = command_ranges[:, 1] - command_ranges[:, 0]
+
         self.actions = torch.zeros(
             (self.num_envs, self.num_actions),
             device=self.device,
@@ -278,6 +381,13 @@ class HoverEnv:
         )
         self.last_actions = torch.zeros_like(self.actions)
 
+        # Bind the actions executed in each step once, since the action
+        # latency setting is fixed: executing the last actions simulates
+        # a one-step action latency. Both buffers are only updated in place.
+        self._exec_actions = (
+            self.last_actions if self.simulate_action_latency else self.actions
+        )
+
         self.base_pos = torch.zeros(
             (self.num_envs, 3), device=self.device, dtype=gs.tc_float
         )
@@ -291,19 +401,47 @@ class HoverEnv:
             (self.num_envs, 3), device=self.device, dtype=gs.tc_float
         )
         self.last_base_pos = torch.zeros_like(self.base_pos)
+        self.rel_pos = torch.zeros_like(self.base_pos)
+        self.last_rel_pos = torch.zeros_like(self.base_pos)
 
         # Configure actuator and observation noise
         self.actuator_noise_std: float = env_cfg["actuator_noise_std"]
         self.obs_noise_std: float = obs_cfg["obs_noise_std"]
 
+        # Pre-allocate buffers for sampling the noise added to the rotor
+        # RPMs and to the observed drone state (all observations except
+        # last actions)
+        self.actuator_noise_buf = torch.empty(
+            (self.num_envs, len(EnvDroneParams.ROTOR_ANGLES_DEG)),
+            device=self.device,
+            dtype=gs.tc_float,
+        )
+        self.obs_noise_buf = torch.empty(
+            (self.num_envs, 13), device=self.device, dtype=gs.tc_float
+        )
+
         self.extras: dict[str, Any] = {}  # extra information for logging
         self.extras["observations"] = {}
 
+        # Pre-allocate the time-out buffer reported in extras
+        self.time_outs = torch.zeros(
+            (self.num_envs,), device=self.device, dtype=gs.tc_float
+        )
+        self.extras["time_outs"] = self.time_outs
+
         # Configure minimum hover time at target for target updates
         self.min_hover_time_s = env_cfg["min_hover_time_s"]
         self.min_hover_steps = math.ceil(self.min_hover_time_s / self.step_dt)
         self.at_target_threshold = env_cfg["at_target_threshold"]
         self.at_target_threshold_square = self.at_target_threshold**2
+        self.inv_at_target_threshold_square = (
+            1 / self.at_target_threshold_square
+        )
+
+        # Constants used by the yaw and angular rewards
+        self.yaw_lambda: float = reward_cfg["yaw_lambda"]
+        self.deg_to_rad = 3.14159 / 180
+        self.inv_pi = 1 / 3.14159
 
         # Initialize buffer to count steps at target
         self.hover_counter = torch.zeros(
@@ -325,15 +463,52 @@ class HoverEnv:
         # Automatically set by `start_recording()`
         self.render = False
 
+        # Squared termination thresholds for the roll and pitch angles,
+        # relative position, and angular and linear velocities (in the
+        # order checked by `compute_post_physics_state`)
+        self.squared_termination_thresholds = torch.tensor(
+            [
+                self.env_cfg["termination_if_roll_greater_than"],
+                self.env_cfg["termination_if_pitch_greater_than"],
+                self.env_cfg["termination_if_x_greater_than"],
+                self.env_cfg["termination_if_y_greater_than"],
+                self.env_cfg["termination_if_z_greater_than"],
+                *[self.env_cfg["termination_if_ang_vel_greater_than"]] * 3,
+                *[self.env_cfg["termination_if_lin_vel_greater_than"]] * 3,
+            ],
+            device=self.device,
+            dtype=gs.tc_float,
+        ).square()
+
+        # Fuse the tensor operations that follow physics stepping (state
+        # updates, termination checks, and rewards) with `torch.compile`.
+        # By default (`None`), they are only compiled on CUDA devices, where
+        # these small kernels are bound by launch overhead. Compilation can
+        # be disabled (e.g., to avoid compilation latency, for debugging, or
+        # on platforms without compiler support) or forced on any device.
+        # Note: The setting is optional for compatibility with saved configs.
+        torch_compile: bool | None = env_cfg.get("torch_compile")
+        if torch_compile is None:
+            torch_compile = self.device.type == "cuda"
+
+        if torch_compile:
+            self._post_physics_update = torch.compile(
+                compute_post_physics_state, dynamic=False
+            )
+            self._compute_rewards = torch.compile(
+                self.compute_rewards, dynamic=False
+            )
+        else:
+            self._post_physics_update = compute_post_physics_state
+            self._compute_rewards = self.compute_rewards
+
     def _resample_commands(self, envs_idx: torch.Tensor) -> None:
-        self.commands[envs_idx, 0] = gs_rand_float(
-            *self.command_cfg["pos_x_range"], (len(envs_idx),), self.device
-        )
-        self.commands[envs_idx, 1] = gs_rand_float(
-            *self.command_cfg["pos_y_range"], (len(envs_idx),), self.device
-        )
-        self.commands[envs_idx, 2] = gs_rand_float(
-            *self.command_cfg["pos_z_range"], (len(envs_idx),), self.device
+        # Sample target positions uniformly within the command ranges
+        # of all axes in a single random draw
+        self.commands[envs_idx, :3] = torch.addcmul(
+            self.command_lower,
+            torch.rand((len(envs_idx), 3), device=self.device),
+            self.command_span,
         )
 
         if self.target is not None:
@@ -342,50 +517,40 @@ class HoverEnv:
             )
 
     def _hovering_at_target(self) -> torch.Tensor:
-        # Get a mask identifying which drones (env indices) are at target
+        # Get a mask identifying which drones (env indices) are at target,
+        # comparing squared distances to avoid computing square roots
         at_target_mask = (
-            torch.norm(self.rel_pos, dim=1) < self.at_target_threshold
+            torch.sum(torch.square(self.rel_pos), dim=1)
+            < self.at_target_threshold_square
         )
 
         if self.min_hover_steps > 0:
-            # Increment counters of drones that are at target
-            self.hover_counter[at_target_mask] += 1
-            # Reset counters for drones that moved away from the target
-            self.hover_counter[~at_target_mask] = 0
+            # Increment counters of drones that are at target and reset
+            # counters of drones that moved away from the target
+            self.hover_counter.add_(1).mul_(at_target_mask)
 
-            # Get indices of drones stabilized at target
+            # Get a mask of drones stabilized at target
             # (hovered at target for at least `min_hover_steps` steps)
-            stabilized_at_target = (
-                (self.hover_counter >= self.min_hover_steps)
-                .nonzero(as_tuple=False)
-                .flatten()
-            )
-
-            return stabilized_at_target
+            return self.hover_counter >= self.min_hover_steps
         else:
-            # Get indices of drones that reached the target
-            at_target = at_target_mask.nonzero(as_tuple=False).flatten()
-
-            return at_target
+            # Get a mask of drones that reached the target
+            return at_target_mask
 
     def reset(self) -> tuple[torch.Tensor, None]:
         self.reset_buf[:] = True
-        self.reset_idx(torch.arange(self.num_envs, device=self.device))
+        self.reset_idx(self.all_envs_idx)
         return self.obs_buf, None
 
     def step(
         self, actions: torch.Tensor
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, dict[str, Any]]:
-        self.actions = torch.clip(
+        torch.clip(
             actions,
             -self.env_cfg["clip_actions"],
             self.env_cfg["clip_actions"],
+            out=self.actions,
         )
-
-        # Simulate action latency
-        exec_actions = (
-            self.last_actions if self.simulate_action_latency else self.actions
-        )
+        exec_actions = self._exec_actions
 
         # Compute rotor RPMs from actions
         if self.action_type in (
@@ -393,12 +558,8 @@ class HoverEnv:
             EnvActionType.CTBR_FIXED_YAW,
         ):
             # Calculate thrust and rate setpoints from actions
-            ctbr_action = linear_interpolate(
-                x=exec_actions,
-                x_min=-1,
-                x_max=1,
-                y_min=self.action_bounds[:, 0],
-                y_max=self.action_bounds[:, 1],
+            ctbr_action = torch.addcmul(
+                self.action_offset, exec_actions, self.action_scale
             )
 
             if self.action_type == EnvActionType.CTBR:
@@ -418,125 +579,91 @@ class HoverEnv:
 
         else:
             # Calculate rotor RPMs directly from actions
-            rotor_RPMs = linear_interpolate(
-                x=exec_actions,
-                x_min=-1,
-                x_max=1,
-                y_min=self.action_bounds[:, 0],
-                y_max=self.action_bounds[:, 1],
+            rotor_RPMs = torch.addcmul(
+                self.action_offset, exec_actions, self.action_scale
             )
 
         # Add actuator noise to rotor RPMs
         if self.actuator_noise_std > 0.0:
-            rotor_RPMs = self._add_noise(rotor_RPMs, self.actuator_noise_std)
-            rotor_RPMs = rotor_RPMs.clamp(
-                EnvActionBounds.MIN_RPM, EnvActionBounds.MAX_RPM
-            )
+            rotor_RPMs = torch.add(
+                rotor_RPMs,
+                self.actuator_noise_buf.normal_(0.0, self.actuator_noise_std),
+            ).clamp_(EnvActionBounds.MIN_RPM, EnvActionBounds.MAX_RPM)
 
-        # perform physics stepping
-        for _ in range(self.decimation):
-            self.drone.set_propellels_rpm(rotor_RPMs)
-            self.scene.step()
-
-            # Draw debug spheres for visual differentiation if enabled
-            if self.drone_colors_enabled:
-                self.draw_colored_spheres()
+        # Convert rotor RPMs once to the contiguous simulator float tensor
+        # set at every physics step
+        rotor_RPMs = rotor_RPMs.to(dtype=gs.tc_float).contiguous()
 
-            # Render camera view if recording
-            if self.render:
-                self.cam.render()
+        # perform physics stepping
+        if not (self.drone_colors_enabled or self.render):
+            # Step without per-step visualization checks
+            for _ in range(self.decimation):
+                self.drone.set_propellels_rpm(rotor_RPMs)
+                self.scene.step()
+        else:
+            for step_idx in range(self.decimation):
+                self.drone.set_propellels_rpm(rotor_RPMs)
+                self.scene.step()
+
+                # Draw debug spheres for visual differentiation if enabled
+                # (once per env step, after its last physics step)
+                if (
+                    self.drone_colors_enabled
+                    and step_idx == self.decimation - 1
+                ):
+                    self.draw_colored_spheres()
+
+                # Render camera view if recording
+                if self.render:
+                    self.cam.render()
 
         # update buffers
         self.episode_length_buf += 1
         self.last_base_pos[:] = self.base_pos[:]
         self.base_pos[:] = self.drone.get_pos()
-        self.rel_pos = self.commands - self.base_pos
-        self.last_rel_pos = self.commands - self.last_base_pos
         self.base_quat[:] = self.drone.get_quat()
-        self.base_euler = quat_to_xyz(
-            transform_quat_by_quat(
-                torch.ones_like(self.base_quat) * self.inv_base_init_quat,
-                self.base_quat,
+        (
+            self.rel_pos[:],
+            self.last_rel_pos[:],
+            self.base_euler,
+            self.base_lin_vel[:],
+            self.base_ang_vel[:],
+            crash_condition,
+        ) = self._post_physics_update(
+            base_pos=self.base_pos,
+            last_base_pos=self.last_base_pos,
+            base_quat=self.base_quat,
+            inv_base_init_quat=self.inv_base_init_quat,
+            commands=self.commands,
+            world_lin_vel=self.drone.get_vel(),
+            world_ang_vel=self.drone.get_ang(),
+            squared_termination_thresholds=(
+                self.squared_termination_thresholds
             ),
-            rpy=True,
-            degrees=True,
-        )
-        inv_base_quat = inv_quat(self.base_quat)
-        self.base_lin_vel[:] = transform_by_quat(
-            self.drone.get_vel(), inv_base_quat
-        )
-        self.base_ang_vel[:] = transform_by_quat(
-            self.drone.get_ang(), inv_base_quat
+            min_base_height=self.env_cfg["termination_if_close_to_ground"],
         )
 
         # resample commands automatically if enabled
         if self.auto_target_updates:
-            stabilized_envs_idx = self._hovering_at_target()
+            stabilized_mask = self._hovering_at_target()
 
-            if len(stabilized_envs_idx) > 0:
+            if stabilized_mask.any():
+                stabilized_envs_idx = stabilized_mask.nonzero(as_tuple=True)[0]
                 self._resample_commands(stabilized_envs_idx)
-                self.hover_counter[stabilized_envs_idx] = 0
+                self.hover_counter.masked_fill_(stabilized_mask, 0)
 
         # check termination and reset
-        self.crash_condition = (
-            (
-                torch.abs(self.base_euler[:, 1])
-                > self.env_cfg["termination_if_pitch_greater_than"]
-            )
-            | (
-                torch.abs(self.base_euler[:, 0])
-                > self.env_cfg["termination_if_roll_greater_than"]
-            )
-            | (
-                torch.abs(self.rel_pos[:, 0])
-                > self.env_cfg["termination_if_x_greater_than"]
-            )
-            | (
-                torch.abs(self.rel_pos[:, 1])
-                > self.env_cfg["termination_if_y_greater_than"]
-            )
-            | (
-                torch.abs(self.rel_pos[:, 2])
-                > self.env_cfg["termination_if_z_greater_than"]
-            )
-            | (
-                self.base_pos[:, 2]
-                < self.env_cfg["termination_if_close_to_ground"]
-            )
-            | (
-                torch.any(
-                    torch.abs(self.base_ang_vel)
-                    > self.env_cfg["termination_if_ang_vel_greater_than"],
-                    dim=1,
-                )
-            )
-            | (
-                torch.any(
-                    torch.abs(self.base_lin_vel)
-                    > self.env_cfg["termination_if_lin_vel_greater_than"],
-                    dim=1,
-                )
-            )
-        )
-        self.reset_buf = (
-            self.episode_length_buf > self.max_episode_length
-        ) | self.crash_condition
-
-        time_out_idx = self.episode_length_buf > self.max_episode_length
-        time_out_idx = time_out_idx.nonzero(as_tuple=False).flatten()
-        self.extras["time_outs"] = torch.zeros_like(
-            self.reset_buf, device=self.device, dtype=gs.tc_float
-        )
-        self.extras["time_outs"][time_out_idx] = 1.0
+        self.crash_condition = crash_condition
+        time_out_mask = self.episode_length_buf > self.max_episode_length
+        self.reset_buf = time_out_mask | self.crash_condition
+        self.time_outs.copy_(time_out_mask)
 
         self.reset_idx(self.reset_buf.nonzero(as_tuple=False).flatten())
 
         # compute reward
-        self.rew_buf[:] = 0.0
-        for name, reward_func in self.reward_functions.items():
-            rew = reward_func() * self.reward_scales[name]
-            self.rew_buf += rew
-            self.episode_sums[name] += rew
+        rewards = self._compute_rewards()
+        torch.sum(rewards, dim=0, out=self.rew_buf)
+        self.episode_sums_buf += rewards
 
         # compute observations
         self.obs_buf = self.compute_observations()
@@ -546,6 +673,14 @@ class HoverEnv:
         # Return obs, rewards, dones, infos
         return self.obs_buf, self.rew_buf, self.reset_buf, self.extras
 
+    def compute_rewards(self) -> torch.Tensor:
+        """Compute the scaled rewards stacked in `reward_functions` order."""
+        rewards = torch.stack(
+            [reward_func() for reward_func in self.reward_functions.values()]
+        )
+
+        return rewards * self.reward_scales_buf
+
     def close(self) -> None:
         if not self._is_closed:
             del self.scene
@@ -557,36 +692,38 @@ class HoverEnv:
         if len(envs_idx) == 0:
             return
 
+        # Index env buffers with a full slice when resetting all envs,
+        # avoiding advanced indexing scatters over the whole buffers
+        buf_idx: torch.Tensor | slice = (
+            slice(None) if len(envs_idx) == self.num_envs else envs_idx
+        )
+
         # reset base
-        self.base_pos[envs_idx] = self.base_init_pos
-        self.last_base_pos[envs_idx] = self.base_init_pos
-        self.rel_pos = self.commands - self.base_pos
-        self.last_rel_pos = self.commands - self.last_base_pos
-        self.base_quat[envs_idx] = self.base_init_quat.reshape(1, -1)
+        self.base_pos[buf_idx] = self.base_init_pos
+        self.last_base_pos[buf_idx] = self.base_init_pos
+        self.rel_pos[buf_idx] = self.commands[buf_idx] - self.base_pos[buf_idx]
+        self.last_rel_pos[buf_idx] = (
+            self.commands[buf_idx] - self.last_base_pos[buf_idx]
+        )
+        self.base_quat[buf_idx] = self.base_init_quat.reshape(1, -1)
         self.drone.set_pos(
-            self.base_pos[envs_idx], zero_velocity=True, envs_idx=envs_idx
+            self.base_pos[buf_idx], zero_velocity=True, envs_idx=envs_idx
         )
         self.drone.set_quat(
-            self.base_quat[envs_idx], zero_velocity=True, envs_idx=envs_idx
+            self.base_quat[buf_idx], zero_velocity=True, envs_idx=envs_idx
         )
-        self.base_lin_vel[envs_idx] = 0
-        self.base_ang_vel[envs_idx] = 0
+        self.base_lin_vel[buf_idx] = 0
+        self.base_ang_vel[buf_idx] = 0
         self.drone.zero_all_dofs_velocity(envs_idx)
 
         # reset buffers
-        self.last_actions[envs_idx] = 0.0
-        self.episode_length_buf[envs_idx] = 0
-        self.reset_buf[envs_idx] = True
-        self.hover_counter[envs_idx] = 0
+        self.last_actions[buf_idx] = 0.0
+        self.episode_length_buf[buf_idx] = 0
+        self.reset_buf[buf_idx] = True
+        self.hover_counter[buf_idx] = 0
 
         # fill extras
-        self.extras["episode"] = {}
-        for key in self.episode_sums.keys():
-            self.extras["episode"]["rew_" + key] = (
-                torch.mean(self.episode_sums[key][envs_idx]).item()
-                / self.env_cfg["episode_length_s"]
-            )
-            self.episode_sums[key][envs_idx] = 0.0
+        self._fill_episode_extras(buf_idx)
 
         # Reset CTBR controller state if a CTBR controller is used
         if self.uses_ctbr_actions:
@@ -594,37 +731,70 @@ class HoverEnv:
 
         self._resample_commands(envs_idx)
 
+    def _fill_episode_extras(self, envs_idx: torch.Tensor | slice) -> None:
+        # Log the mean episode reward sums of the reset envs, transferring
+        # them to the host at once, and clear their sums
+        num_rewards = len(self.episode_sums)
+        mean_episode_sums = (
+            self.episode_sums_buf[:, envs_idx]
+            .reshape(num_rewards, -1)
+            .mean(dim=1)
+            .tolist()
+        )
+        self.extras["episode"] = {
+            "rew_" + key: mean_sum / self.env_cfg["episode_length_s"]
+            for key, mean_sum in zip(
+                self.episode_sums, mean_episode_sums, strict=True
+            )
+        }
+        self.episode_sums_buf[:, envs_idx] = 0.0
+
     def compute_observations(self) -> torch.Tensor:
+        # Write observations in place into their scratch buffer columns:
+        # pos (0:3), quat (3:7), lin_vel (7:10), ang_vel (10:13),
+        # and last actions (13:)
+        obs_buf = self.obs_scratch_buf
+        obs_state = obs_buf[:, :13]
+        obs_quat = obs_buf[:, 3:7]
+
         # Normalize observations to the [-1, 1] range
-        pos = torch.clip(self.rel_pos * self.obs_scales["rel_pos"], -1, 1)
-        quat = self.base_quat.clone()
-        lin_vel = torch.clip(
-            self.base_lin_vel * self.obs_scales["lin_vel"], -1, 1
+        torch.clip(
+            self.rel_pos * self.obs_scales["rel_pos"],
+            -1,
+            1,
+            out=obs_buf[:, 0:3],
+        )
+        obs_quat.copy_(self.base_quat)
+        torch.clip(
+            self.base_lin_vel * self.obs_scales["lin_vel"],
+            -1,
+            1,
+            out=obs_buf[:, 7:10],
         )
-        ang_vel = torch.clip(
-            self.base_ang_vel * self.obs_scales["ang_vel"], -1, 1
+        torch.clip(
+            self.base_ang_vel * self.obs_scales["ang_vel"],
+            -1,
+            1,
+            out=obs_buf[:, 10:13],
         )
-        last_actions = self.last_actions
+        obs_buf[:, 13:] = self.last_actions
 
         # Add noise to observations except last actions
         if self.obs_noise_std > 0.0:
-            pos = self._add_noise(pos, self.obs_noise_std)
-            lin_vel = self._add_noise(lin_vel, self.obs_noise_std)
-            ang_vel = self._add_noise(ang_vel, self.obs_noise_std)
+            self._add_noise_(obs_state, self.obs_noise_buf, self.obs_noise_std)
 
-            # Add noise to quaternions
+            # Normalize noisy quaternions
             # Note:
             # Directly adding Gaussian noise to quaternions and then
             # normalizing them approximates valid rotation noise only
             # for small standard deviations.
-            quat = self._add_noise(quat, self.obs_noise_std)
-            quat = quat / quat.norm(dim=1, keepdim=True)
-
-        obs_buf = torch.cat(
-            [pos, quat, lin_vel, ang_vel, last_actions], dim=-1
-        )
+            obs_quat.div_(
+                torch.linalg.vector_norm(obs_quat, dim=1, keepdim=True)
+            )
 
-        return obs_buf
+        # Return a copy so previously returned observations
+        # are not overwritten by later steps
+        return obs_buf.clone()
 
     def get_observations(self) -> tuple[torch.Tensor, dict[str, Any]]:
         return self.obs_buf, self.extras
@@ -635,13 +805,13 @@ class HoverEnv:
             # Note:
             # Gaussian noise is added to normalized observations, so it
             # must be scaled when applied to absolute positions.
-            pos_noise = (
-                torch.randn_like(self.base_pos)
-                * self.obs_noise_std
-                / self.obs_scales["rel_pos"]
-            )
+            pos_noise_std = self.obs_noise_std / self.obs_scales["rel_pos"]
 
-            return self.base_pos + pos_noise
+            return torch.add(
+                self.base_pos,
+                torch.randn_like(self.base_pos),
+                alpha=pos_noise_std,
+            )
 
         return self.base_pos
 
@@ -652,7 +822,7 @@ class HoverEnv:
             # This Gaussian noise addition approximates valid rotation
             # noise only for small standard deviations
             quat = self._add_noise(self.base_quat, self.obs_noise_std)
-            quat = quat / quat.norm(dim=1, keepdim=True)
+            quat = quat / torch.linalg.vector_norm(quat, dim=1, keepdim=True)
 
             return quat
 
@@ -663,6 +833,15 @@ class HoverEnv:
     ) -> torch.Tensor:
         return input_tensor + torch.randn_like(input_tensor) * noise_std
 
+    def _add_noise_(
+        self,
+        input_tensor: torch.Tensor,
+        noise_buf: torch.Tensor,
+        noise_std: float,
+    ) -> torch.Tensor:
+        # Sample noise into a reusable buffer and add it in place
+        return input_tensor.add_(noise_buf.normal_(0.0, noise_std))
+
     # ------------ target position update ------------
     def update_target_pos(
         self, envs_idx: torch.Tensor, target_pos: torch.Tensor
@@ -740,13 +919,7 @@ class HoverEnv:
         self.reset_buf[envs_idx] = True
 
         # Fill extras
-        self.extras["episode"] = {}
-        for key in self.episode_sums.keys():
-            self.extras["episode"]["rew_" + key] = (
-                torch.mean(self.episode_sums[key][envs_idx]).item()
-                / self.env_cfg["episode_length_s"]
-            )
-            self.episode_sums[key][envs_idx] = 0.0
+        self._fill_episode_extras(envs_idx)
 
         # Load CTBR controller state if the action type is CTBR
         if self.uses_ctbr_actions:
@@ -766,6 +939,18 @@ class HoverEnv:
                 )
 
             self.drone_colors = drone_colors
+
+            # Group drone env indices by color to draw
+            # the spheres of each color in a single call
+            color_env_idxs: dict[tuple[float, ...], list[int]] = {}
+            for env_idx, color in enumerate(drone_colors):
+                color_env_idxs.setdefault(tuple(color), []).append(env_idx)
+
+            self.drone_color_groups = [
+                (color, torch.tensor(env_idxs, device=self.device))
+                for color, env_idxs in color_env_idxs.items()
+            ]
+
             self.drone_offsets = torch.from_numpy(self.scene.envs_offset).to(
                 device=self.device, dtype=torch.float
             )
@@ -780,12 +965,12 @@ class HoverEnv:
         local_pos = self.drone.get_pos()
         world_pos = local_pos + self.drone_offsets
 
-        # Draw colored spheres for each drone
-        for i in range(self.num_envs):
-            self.scene.draw_debug_sphere(
-                pos=world_pos[i],
+        # Draw colored spheres for each group of same-colored drones
+        for color, env_idxs in self.drone_color_groups:
+            self.scene.draw_debug_spheres(
+                poss=world_pos[env_idxs],
                 radius=0.03,
-                color=self.drone_colors[i],
+                color=color,
             )
 
     # ------------ video recording functions----------------
@@ -814,21 +999,23 @@ class HoverEnv:
 
     # ------------ reward functions----------------
     def _reward_target(self) -> torch.Tensor:
+        # Difference of squared distances to the target, factored as
+        # (a - b) . (a + b) to compute it with a single reduction
         target_rew = torch.sum(
-            torch.square(self.last_rel_pos), dim=1
-        ) - torch.sum(torch.square(self.rel_pos), dim=1)
+            (self.last_rel_pos - self.rel_pos)
+            * (self.last_rel_pos + self.rel_pos),
+            dim=1,
+        )
         return target_rew
 
     def _reward_closeness(self) -> torch.Tensor:
-        dist_square = torch.sum(torch.square(self.rel_pos), dim=1)
+        dist_square = torch.sum(self.rel_pos * self.rel_pos, dim=1)
 
         # Reward is 1 at the target and decreases linearly to 0
         # at `at_target_threshold` distance
-        closeness_rew = torch.clamp(
-            (self.at_target_threshold_square - dist_square)
-            / self.at_target_threshold_square,
-            min=0.0,
-        )
+        closeness_rew = (
+            1.0 - dist_square * self.inv_at_target_threshold_square
+        ).clamp_min_(0.0)
 
         return closeness_rew
 
@@ -837,24 +1024,24 @@ class HoverEnv:
         return hover_rew
 
     def _reward_smooth(self) -> torch.Tensor:
-        smooth_rew = torch.sum(
-            torch.square(self.actions - self.last_actions), dim=1
-        )
+        action_diff = self.actions - self.last_actions
+        smooth_rew = torch.sum(action_diff * action_diff, dim=1)
         return smooth_rew
 
     def _reward_yaw(self) -> torch.Tensor:
         yaw = self.base_euler[:, 2]
-        yaw = torch.where(yaw > 180, yaw - 360, yaw) / 180 * 3.14159  # (rad)
-        yaw_rew = torch.exp(self.reward_cfg["yaw_lambda"] * torch.abs(yaw))
+        yaw = torch.where(yaw > 180, yaw - 360, yaw)
+        yaw_rew = torch.exp(yaw.abs_().mul_(self.yaw_lambda * self.deg_to_rad))
         return yaw_rew
 
     def _reward_angular(self) -> torch.Tensor:
-        angular_rew = torch.norm(self.base_ang_vel / 3.14159, dim=1)
+        angular_rew = torch.linalg.vector_norm(self.base_ang_vel, dim=1).mul_(
+            self.inv_pi
+        )
         return angular_rew
 
     def _reward_crash(self) -> torch.Tensor:
-        crash_rew = torch.zeros(
-            (self.num_envs,), device=self.device, dtype=gs.tc_float
-        )
-        crash_rew[self.crash_condition] = 1
+        # Cast the crash mask instead of scattering into a zeros tensor to
+        # keep the compiled reward computation free of masked assignments
+        crash_rew = self.crash_condition.to(gs.tc_float)
         return crash_rew
@@ -36,6 +36,9 @@ def get_cfgs() -> tuple[CfgDict, CfgDict, CfgDict, CfgDict]:
         # simulation
         "dt": 0.01,  # sim freq = 100 Hz
         "decimation": 4,  # ctrl freq = 1 / (0.01 * 4) = 25 Hz
+        # compile post-physics updates and rewards with `torch.compile`
+        # (True, False, or None to compile only on CUDA devices)
+        "torch_compile": None,
         # actions
         "simulate_action_latency": True,
         "clip_actions": 1.0,
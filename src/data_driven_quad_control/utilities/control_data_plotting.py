@@ -17,6 +17,9 @@ class ControlTrajectory:
     control_inputs: list[np.ndarray]
     system_outputs: list[np.ndarray]
     system_setpoint: np.ndarray
+    # Whether each control input was newly computed (`True`) or reused from
+    # the previous step (`False`). Only recorded for asynchronous stepping.
+    action_freshness: list[np.ndarray] | None = None
 
 
 def plot_trajectory_comparison(
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Any
 
 import torch
@@ -70,11 +71,41 @@ def get_tensor_from_env_idx(
     env_idx: int | list[int] | tuple[int, ...] | torch.Tensor,
 ) -> torch.Tensor:
     # Convert env_idx into a 1D tensor of env indices
+    # Note: Tensors built from int, list, or tuple indices are cached and
+    # shared between calls. They are read-only (see
+    # `_get_cached_env_idx_tensor`) and must be cloned before modification.
     if isinstance(env_idx, int):
-        return torch.tensor([env_idx], dtype=torch.long, device=env.device)
+        return _get_cached_env_idx_tensor((env_idx,), env.device)
     elif isinstance(env_idx, (list, tuple)):
-        return torch.tensor(env_idx, dtype=torch.long, device=env.device)
+        return _get_cached_env_idx_tensor(tuple(env_idx), env.device)
     elif isinstance(env_idx, torch.Tensor):
         return env_idx.to(dtype=torch.long, device=env.device)
     else:
         raise TypeError(f"Unsupported env_idx type: {type(env_idx)}")
+
+
+@lru_cache(maxsize=128)
+def _get_cached_env_idx_tensor(
+    env_idx: tuple[int, ...], device: torch.device
+) -> torch.Tensor:
+    """
+    Get a read-only 1D tensor of env indices, built once per index tuple and
+    device to avoid repeated allocations and host-to-device transfers.
+
+    The cache is keyed per `(env_idx, device)` pair, and every call with the
+    same key returns the same tensor object. To guard this shared tensor, it
+    is created as an inference tensor, so any in-place update outside of
+    `torch.inference_mode()` raises a `RuntimeError` instead of silently
+    corrupting the indices returned to other callers. Callers that need a
+    mutable tensor must clone it.
+
+    Args:
+        env_idx (tuple[int, ...]): The env indices.
+        device (torch.device): The device on which the tensor is created.
+
+    Returns:
+        torch.Tensor: A read-only tensor of env indices with dtype
+            `torch.long`.
+    """
+    with torch.inference_mode():
+        return torch.tensor(env_idx, dtype=torch.long, device=device)
@@ -63,6 +63,35 @@ def quaternion_to_matrix(quats: torch.Tensor) -> torch.Tensor:
     return rot.reshape(quats.shape[:-1] + (3, 3))
 
 
+def rotate_vectors_by_quaternion(
+    vectors: torch.Tensor, quats: torch.Tensor
+) -> torch.Tensor:
+    """
+    Rotate a batch of 3D vectors by quaternions.
+
+    The vectors and quaternions are broadcast against each other, so that
+    multiple stacked vectors can be rotated by the same quaternion in a
+    single call (e.g., vectors of shape (N, K, 3) with quaternions of shape
+    (N, 1, 4)).
+
+    Args:
+        vectors (torch.Tensor): Batch of vectors of shape (..., 3).
+        quats (torch.Tensor): Batch of unit quaternions of shape (..., 4)
+            with quaternions in a (w, x, y, z) format.
+
+    Returns:
+        torch.Tensor: Rotated vectors of shape (..., 3).
+    """
+    w = quats[..., :1]
+    q_vec = quats[..., 1:]
+
+    # v' = v + w * t + q_vec x t, with t = 2 * (q_vec x v)
+    q_vec, vectors = torch.broadcast_tensors(q_vec, vectors)
+    t = 2 * torch.linalg.cross(q_vec, vectors)
+
+    return vectors + w * t + torch.linalg.cross(q_vec, t)
+
+
 def yaw_from_quaternion(quats: torch.Tensor) -> torch.Tensor:
     """
     Calculate yaw angles from a batch of quaternions.
@@ -1,4 +1,3 @@
-import multiprocessing as mp
 from unittest.mock import Mock, patch
 
 import numpy as np
@@ -15,6 +14,11 @@ from data_driven_quad_control.comparison.utilities.controller_comparison_config
 from data_driven_quad_control.comparison.utilities.controller_workers.dd_mpc_worker import (  # noqa: E501
     dd_mpc_controller_worker,
 )
+from data_driven_quad_control.comparison.utilities.shared_memory_ipc import (  # noqa: E501
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+)
 
 DD_MPC_CONTROLLER_CREATION_PATCH_PATH = (
     "data_driven_quad_control.comparison.utilities.controller_workers."
@@ -33,48 +37,45 @@ def test_dd_mpc_controller_worker(
     # Ensure mocked controller uses single stepping to simplify testing
     mock_dd_mpc_controller.n_mpc_step = 1
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_ring = SharedMemoryRing(3)
     dummy_init_data = DDMPCControllerInitData(
         controller_config=Mock(), u_N=np.zeros((1, 10)), y_N=np.zeros((1, 10))
     )
 
-    # Send dummy signals to queues
+    # Define dummy target signals
     target_signal = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=True, done=False
+        target_pos=torch.zeros((1, 3)), is_new_target=True, done=False
     )
     target_signal_done = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=False, done=True
+        target_pos=torch.zeros((1, 3)), is_new_target=False, done=True
     )
 
-    dummy_target_signal_queue.put(target_signal)
-
-    # Send target signal to terminate the worker execution
-    dummy_target_signal_queue.put(target_signal_done)
+    # Receive a second target signal to terminate the worker execution
+    dummy_target_signal.receive.side_effect = [
+        target_signal,
+        target_signal_done,
+    ]
 
-    # Fill obs_queue with dummy observations
-    dummy_obs_queue.put(np.array([[0.0], [0.0]]))
-    dummy_obs_queue.put(np.array([[0.1], [0.1]]))
+    # Fill obs_ring with dummy observations
+    dummy_obs_ring.write(np.array([0.0, 0.0, 0.0]))
+    dummy_obs_ring.write(np.array([0.1, 0.1, 0.1]))
 
     dd_mpc_controller_worker(
         env_idx=0,
         dd_mpc_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        dd_mpc_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        dd_mpc_obs_ring=dummy_obs_ring,
     )
 
     # Validate that the controller was initialized
     mock_create_controller.assert_called_once()
 
     # Verify that exactly two control actions were produced by the controller
-    try:
-        dummy_action_queue.get(timeout=1)
-        dummy_action_queue.get(timeout=1)
-    except Exception as e:
-        pytest.fail(f"Unexpected exception raised: {e}")
+    assert dummy_action_slots.write.call_count == 2
 
 
 @pytest.mark.parametrize("target_signal_done_first", [True, False])
@@ -90,60 +91,103 @@ def test_dd_mpc_worker_exit_on_done(
     # Ensure mocked controller uses single stepping to simplify testing
     mock_dd_mpc_controller.n_mpc_step = 1
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_ring = SharedMemoryRing(3)
     dummy_init_data = DDMPCControllerInitData(
         controller_config=Mock(),
         u_N=np.zeros((1, 1)),
         y_N=np.zeros((1, 1)),
     )
 
-    # Send dummy target signal and observation to queues
-    dummy_drone_pos = torch.zeros((10, 1))
-    dummy_target_signal_queue.put(
+    # Define dummy target signals and send observation to obs ring
+    dummy_drone_pos = torch.zeros(3)
+    target_signals = [
         EnvTargetSignal(
             target_pos=dummy_drone_pos,
             is_new_target=False,
             done=target_signal_done_first,
         )
-    )
-    dummy_obs_queue.put(dummy_drone_pos)
+    ]
+    dummy_obs_ring.write(dummy_drone_pos)
 
-    # If the first signal doesn't terminate the worker execution, send a second
+    # If the first signal doesn't terminate the worker execution, add a second
     # one with `done = True` to ensure termination after the second iteration
     if not target_signal_done_first:
-        dummy_target_signal_queue.put(
+        target_signals.append(
             EnvTargetSignal(
                 target_pos=dummy_drone_pos,
                 is_new_target=False,
                 done=True,
             )
         )
-        dummy_obs_queue.put(dummy_drone_pos)
+        dummy_obs_ring.write(dummy_drone_pos)
+
+    dummy_target_signal.receive.side_effect = target_signals
 
     dd_mpc_controller_worker(
         env_idx=0,
         dd_mpc_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        dd_mpc_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        dd_mpc_obs_ring=dummy_obs_ring,
     )
 
-    # Verify number of actions sent via the action queue
+    # Verify number of actions sent via the action slots
     # based on the initial done signal
     if target_signal_done_first:
         # If done immediately, only one action should be sent
-        try:
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 1
     else:
         # Otherwise, an additional action should be set, as we iterate
         # for one more step to send the `done = True` signal
-        try:
-            dummy_action_queue.get(timeout=1)
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 2
+
+
+@patch(DD_MPC_CONTROLLER_CREATION_PATCH_PATH)
+def test_dd_mpc_worker_multi_step(
+    mock_create_controller: Mock,
+    mock_dd_mpc_controller: NonlinearDataDrivenMPCController,
+) -> None:
+    # Mock return value of `create_nonlinear_data_driven_mpc_controller`
+    mock_create_controller.return_value = mock_dd_mpc_controller
+
+    # Use multi-step control cycles
+    mock_dd_mpc_controller.n_mpc_step = 2
+    mock_dd_mpc_controller.update_and_solve_data_driven_mpc = Mock()
+
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_ring = SharedMemoryRing(3, capacity=3)
+    dummy_init_data = DDMPCControllerInitData(
+        controller_config=Mock(), u_N=np.zeros((1, 1)), y_N=np.zeros((1, 1))
+    )
+
+    # Define three signals, terminating in the middle of the second cycle
+    target_signals = []
+    for done in (False, False, True):
+        target_signals.append(
+            EnvTargetSignal(
+                target_pos=torch.zeros(3), is_new_target=False, done=done
+            )
+        )
+        dummy_obs_ring.write(torch.zeros(3))
+
+    dummy_target_signal.receive.side_effect = target_signals
+
+    dd_mpc_controller_worker(
+        env_idx=0,
+        dd_mpc_controller_init_data=dummy_init_data,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        dd_mpc_obs_ring=dummy_obs_ring,
+    )
+
+    # Verify that one action is sent per step and that
+    # the MPC problem is solved once per control cycle
+    assert dummy_action_slots.write.call_count == 3
+    assert (
+        mock_dd_mpc_controller.update_and_solve_data_driven_mpc.call_count == 2
+    )
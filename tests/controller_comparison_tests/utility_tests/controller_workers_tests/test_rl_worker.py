@@ -1,4 +1,3 @@
-import multiprocessing as mp
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -12,6 +11,11 @@ from data_driven_quad_control.comparison.utilities.controller_comparison_config
 from data_driven_quad_control.comparison.utilities.controller_workers.rl_worker import (  # noqa: E501
     rl_controller_worker,
 )
+from data_driven_quad_control.comparison.utilities.shared_memory_ipc import (  # noqa: E501
+    SharedActionSlots,
+    SharedTargetSignal,
+    SharedTensorChannel,
+)
 
 RL_RUNNER_PATCH_PATH = (
     "data_driven_quad_control.comparison.utilities.controller_workers."
@@ -41,12 +45,13 @@ def test_rl_worker(
     mock_on_policy_runner: MockOnPolicyRunner,
 ) -> None:
     # Define test parameters
+    num_obs = 10
     dummy_env_specs = {
         "device": torch.device("cpu"),
         "step_dt": 0.1,
         "num_envs": 1,
-        "num_obs": 1,
-        "num_actions": 1,
+        "num_obs": num_obs,
+        "num_actions": num_obs,  # Mocked policy returns its observation
         "max_episode_length": 1,
     }
 
@@ -56,50 +61,47 @@ def test_rl_worker(
     # Mock return value of `OnPolicyRunner`
     mock_runner_class.return_value = mock_runner
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_channel = SharedTensorChannel(num_obs)
 
-    dummy_env_observation = torch.zeros((10, 1))
+    dummy_env_observation = torch.zeros(num_obs)
     dummy_init_data = RLControllerInitData(
         train_cfg=Mock(),
         model_path="dummy_model.pt",
         initial_observation=dummy_env_observation,
     )
 
-    # Send dummy signals to queues
+    # Define dummy target signals
     target_signal = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=True, done=False
+        target_pos=torch.zeros((1, 3)), is_new_target=True, done=False
     )
     target_signal_done = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=False, done=True
+        target_pos=torch.zeros((1, 3)), is_new_target=False, done=True
     )
 
-    dummy_target_signal_queue.put(target_signal)
-
-    # Send target signal to terminate the worker execution
-    dummy_target_signal_queue.put(target_signal_done)
+    # Receive a second target signal to terminate the worker execution
+    dummy_target_signal.receive.side_effect = [
+        target_signal,
+        target_signal_done,
+    ]
 
-    # Fill obs_queue with dummy observations
-    dummy_obs_queue.put(dummy_env_observation)
-    dummy_obs_queue.put(dummy_env_observation)
+    # Send dummy observation to obs channel
+    dummy_obs_channel.write(dummy_env_observation)
+    dummy_obs_channel.write(dummy_env_observation)
 
     rl_controller_worker(
         env_idx=0,
         env_specs=dummy_env_specs,
         rl_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        rl_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        rl_obs_channel=dummy_obs_channel,
     )
 
     # Verify that exactly two control actions were produced by the controller
-    try:
-        dummy_action_queue.get(timeout=1)
-        dummy_action_queue.get(timeout=1)
-    except Exception as e:
-        pytest.fail(f"Unexpected exception raised: {e}")
+    assert dummy_action_slots.write.call_count == 2
 
 
 @pytest.mark.parametrize("done_signal_first", [True, False])
@@ -110,12 +112,13 @@ def test_rl_worker_exit_on_done(
     mock_on_policy_runner: MockOnPolicyRunner,
 ) -> None:
     # Define test parameters
+    num_obs = 10
     dummy_env_specs = {
         "device": torch.device("cpu"),
         "step_dt": 0.1,
         "num_envs": 1,
-        "num_obs": 1,
-        "num_actions": 1,
+        "num_obs": num_obs,
+        "num_actions": num_obs,  # Mocked policy returns its observation
         "max_episode_length": 1,
     }
 
@@ -125,62 +128,57 @@ def test_rl_worker_exit_on_done(
     # Mock return value of `OnPolicyRunner`
     mock_runner_class.return_value = mock_runner
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_channel = SharedTensorChannel(num_obs)
 
-    dummy_env_observation = torch.zeros((10, 1))
+    dummy_env_observation = torch.zeros(num_obs)
     dummy_init_data = RLControllerInitData(
         train_cfg=Mock(),
         model_path="dummy_model.pt",
         initial_observation=dummy_env_observation,
     )
 
-    # Send dummy target signal and observation to queues
-    dummy_target_signal_queue.put(
+    # Define dummy target signals and send observation to obs channel
+    target_signals = [
         EnvTargetSignal(
-            target_pos=torch.zeros((3, 1)),
+            target_pos=torch.zeros((1, 3)),
             is_new_target=False,
             done=done_signal_first,
         )
-    )
-    dummy_obs_queue.put(dummy_env_observation)
+    ]
+    dummy_obs_channel.write(dummy_env_observation)
 
-    # If the first signal doesn't terminate the worker execution, send a second
+    # If the first signal doesn't terminate the worker execution, add a second
     # one with `done = True` to ensure termination after the second iteration
     if not done_signal_first:
-        dummy_target_signal_queue.put(
+        target_signals.append(
             EnvTargetSignal(
-                target_pos=torch.zeros((3, 1)),
+                target_pos=torch.zeros((1, 3)),
                 is_new_target=False,
                 done=True,
             )
         )
-        dummy_obs_queue.put(dummy_env_observation)
+        dummy_obs_channel.write(dummy_env_observation)
+
+    dummy_target_signal.receive.side_effect = target_signals
 
     rl_controller_worker(
         env_idx=0,
         env_specs=dummy_env_specs,
         rl_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        rl_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        rl_obs_channel=dummy_obs_channel,
     )
 
-    # Verify number of actions sent via the action queue
+    # Verify number of actions sent via the action slots
     # based on the done signal
     if done_signal_first:
         # If done immediately, only one action should be sent
-        try:
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 1
     else:
         # Otherwise, an additional action should be set, as we iterate
         # for one more step to send the `done = True` signal
-        try:
-            dummy_action_queue.get(timeout=1)
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 2
@@ -1,4 +1,3 @@
-import multiprocessing as mp
 from unittest.mock import Mock, patch
 
 import pytest
@@ -11,6 +10,11 @@ from data_driven_quad_control.comparison.utilities.controller_comparison_config
 from data_driven_quad_control.comparison.utilities.controller_workers.tracking_worker import (  # noqa: E501
     tracking_controller_worker,
 )
+from data_driven_quad_control.comparison.utilities.shared_memory_ipc import (  # noqa: E501
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+)
 from data_driven_quad_control.controllers.tracking.tracking_controller import (  # noqa: E501
     DroneTrackingController,
 )
@@ -32,14 +36,14 @@ def test_tracking_worker(
     # Mock return value of `DroneTrackingController`
     mock_tracking_controller_class.return_value = mock_tracking_controller
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_ring = SharedMemoryRing(7)
 
     dummy_tracking_drone_state = TrackingCtrlDroneState(
-        X=torch.zeros((3, 1)),
-        Q=torch.zeros((4, 1)),
+        X=torch.zeros((1, 3)),
+        Q=torch.zeros((1, 4)),
     )
     dummy_init_data = TrackingControllerInitData(
         controller_config=Mock(),
@@ -47,38 +51,37 @@ def test_tracking_worker(
         initial_state=dummy_tracking_drone_state,
     )
 
-    # Send dummy signals to queues
+    # Define dummy target signals
     target_signal = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=True, done=False
+        target_pos=torch.zeros((1, 3)), is_new_target=True, done=False
     )
     target_signal_done = EnvTargetSignal(
-        target_pos=torch.zeros((3, 1)), is_new_target=False, done=True
+        target_pos=torch.zeros((1, 3)), is_new_target=False, done=True
     )
 
-    dummy_target_signal_queue.put(target_signal)
-
-    # Send target signal to terminate the worker execution
-    dummy_target_signal_queue.put(target_signal_done)
+    # Receive a second target signal to terminate the worker execution
+    dummy_target_signal.receive.side_effect = [
+        target_signal,
+        target_signal_done,
+    ]
 
-    # Fill obs_queue with dummy observations
-    dummy_obs_queue.put(dummy_tracking_drone_state)
-    dummy_obs_queue.put(dummy_tracking_drone_state)
+    # Fill obs_ring with dummy observations
+    for _ in range(2):
+        dummy_obs_ring.write(
+            dummy_tracking_drone_state.X, dummy_tracking_drone_state.Q
+        )
 
     tracking_controller_worker(
         env_idx=0,
         env_device=torch.device("cpu"),
         tracking_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        tracking_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        tracking_obs_ring=dummy_obs_ring,
     )
 
     # Verify that exactly two control actions were produced by the controller
-    try:
-        dummy_action_queue.get(timeout=1)
-        dummy_action_queue.get(timeout=1)
-    except Exception as e:
-        pytest.fail(f"Unexpected exception raised: {e}")
+    assert dummy_action_slots.write.call_count == 2
 
 
 @pytest.mark.parametrize("done_signal_first", [True, False])
@@ -91,14 +94,14 @@ def test_tracking_worker_exit_on_done(
     # Mock return value of `DroneTrackingController`
     mock_tracking_controller_class.return_value = mock_tracking_controller
 
-    # Create dummy queues and initialization data
-    dummy_target_signal_queue: mp.Queue = mp.Queue()
-    dummy_action_queue: mp.Queue = mp.Queue()
-    dummy_obs_queue: mp.Queue = mp.Queue()
+    # Create dummy communication channels and initialization data
+    dummy_target_signal = Mock(spec=SharedTargetSignal)
+    dummy_action_slots = Mock(spec=SharedActionSlots)
+    dummy_obs_ring = SharedMemoryRing(7)
 
     dummy_tracking_drone_state = TrackingCtrlDroneState(
-        X=torch.zeros((3, 1)),
-        Q=torch.zeros((4, 1)),
+        X=torch.zeros((1, 3)),
+        Q=torch.zeros((1, 4)),
     )
     dummy_init_data = TrackingControllerInitData(
         controller_config=Mock(),
@@ -106,50 +109,49 @@ def test_tracking_worker_exit_on_done(
         initial_state=dummy_tracking_drone_state,
     )
 
-    # Send dummy target signal and observation to queues
-    dummy_target_signal_queue.put(
+    # Define dummy target signals and send observation to obs ring
+    target_signals = [
         EnvTargetSignal(
-            target_pos=torch.zeros((3, 1)),
+            target_pos=torch.zeros((1, 3)),
             is_new_target=False,
             done=done_signal_first,
         )
+    ]
+    dummy_obs_ring.write(
+        dummy_tracking_drone_state.X, dummy_tracking_drone_state.Q
     )
-    dummy_obs_queue.put(dummy_tracking_drone_state)
 
-    # If the first signal doesn't terminate the worker execution, send a second
+    # If the first signal doesn't terminate the worker execution, add a second
     # one with `done = True` to ensure termination after the second iteration
     if not done_signal_first:
-        dummy_target_signal_queue.put(
+        target_signals.append(
             EnvTargetSignal(
-                target_pos=torch.zeros((3, 1)),
+                target_pos=torch.zeros((1, 3)),
                 is_new_target=False,
                 done=True,
             )
         )
-        dummy_obs_queue.put(dummy_tracking_drone_state)
+        dummy_obs_ring.write(
+            dummy_tracking_drone_state.X, dummy_tracking_drone_state.Q
+        )
+
+    dummy_target_signal.receive.side_effect = target_signals
 
     tracking_controller_worker(
         env_idx=0,
         env_device=torch.device("cpu"),
         tracking_controller_init_data=dummy_init_data,
-        target_signal_queue=dummy_target_signal_queue,
-        action_queue=dummy_action_queue,
-        tracking_obs_queue=dummy_obs_queue,
+        target_signal=dummy_target_signal,
+        action_slots=dummy_action_slots,
+        tracking_obs_ring=dummy_obs_ring,
     )
 
-    # Verify number of actions sent via the action queue
+    # Verify number of actions sent via the action slots
     # based on the done signal
     if done_signal_first:
         # If done immediately, only one action should be sent
-        try:
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 1
     else:
         # Otherwise, an additional action should be set, as we iterate
         # for one more step to send the `done = True` signal
-        try:
-            dummy_action_queue.get(timeout=1)
-            dummy_action_queue.get(timeout=1)
-        except Exception as e:
-            pytest.fail(f"Unexpected exception raised: {e}")
+        assert dummy_action_slots.write.call_count == 2
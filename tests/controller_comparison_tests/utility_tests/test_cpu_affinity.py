@@ -0,0 +1,112 @@
+from unittest.mock import Mock, call, patch
+
+from data_driven_quad_control.comparison.utilities.cpu_affinity import (
+    pin_worker_to_cpu,
+    reserve_worker_cpus,
+    set_process_cpu_affinity,
+)
+
+CPU_AFFINITY_PATH = (
+    "data_driven_quad_control.comparison.utilities.cpu_affinity."
+)
+
+SCHED_SETAFFINITY_PATCH_PATH = CPU_AFFINITY_PATH + "os.sched_setaffinity"
+SCHED_GETAFFINITY_PATCH_PATH = CPU_AFFINITY_PATH + "os.sched_getaffinity"
+LISTDIR_PATCH_PATH = CPU_AFFINITY_PATH + "os.listdir"
+
+
+@patch(LISTDIR_PATCH_PATH)
+@patch(SCHED_SETAFFINITY_PATCH_PATH)
+def test_set_process_cpu_affinity(
+    mock_sched_setaffinity: Mock, mock_listdir: Mock
+) -> None:
+    # Mock a process with three threads, one of which exits before its
+    # affinity is set
+    mock_listdir.return_value = ["100", "101", "102"]
+
+    def dummy_sched_setaffinity(pid: int, cpus: set[int]) -> None:
+        if pid == 102:
+            raise ProcessLookupError
+
+    mock_sched_setaffinity.side_effect = dummy_sched_setaffinity
+
+    set_process_cpu_affinity({2, 3})
+
+    # Verify that the affinity is set for the calling thread
+    # and for every thread of the process
+    mock_sched_setaffinity.assert_has_calls(
+        [
+            call(0, {2, 3}),
+            call(100, {2, 3}),
+            call(101, {2, 3}),
+            call(102, {2, 3}),
+        ]
+    )
+
+
+@patch(LISTDIR_PATCH_PATH)
+@patch(SCHED_SETAFFINITY_PATCH_PATH)
+def test_set_process_cpu_affinity_without_thread_list(
+    mock_sched_setaffinity: Mock, mock_listdir: Mock
+) -> None:
+    mock_listdir.side_effect = FileNotFoundError
+
+    set_process_cpu_affinity({1})
+
+    # Verify that only the calling thread is updated
+    mock_sched_setaffinity.assert_called_once_with(0, {1})
+
+
+@patch(LISTDIR_PATCH_PATH)
+@patch(SCHED_SETAFFINITY_PATCH_PATH)
+def test_pin_worker_to_cpu(
+    mock_sched_setaffinity: Mock, mock_listdir: Mock
+) -> None:
+    mock_listdir.return_value = ["200", "201"]
+
+    # Verify that the affinity is left unchanged if no core is assigned
+    pin_worker_to_cpu(None)
+    mock_sched_setaffinity.assert_not_called()
+
+    # Verify that every thread of the worker is pinned to its core
+    pin_worker_to_cpu(5)
+    mock_sched_setaffinity.assert_has_calls(
+        [call(0, {5}), call(200, {5}), call(201, {5})]
+    )
+
+
+@patch(LISTDIR_PATCH_PATH)
+@patch(SCHED_GETAFFINITY_PATCH_PATH)
+@patch(SCHED_SETAFFINITY_PATCH_PATH)
+def test_reserve_worker_cpus(
+    mock_sched_setaffinity: Mock,
+    mock_sched_getaffinity: Mock,
+    mock_listdir: Mock,
+) -> None:
+    mock_sched_getaffinity.return_value = {0, 1, 2, 3, 4}
+    mock_listdir.return_value = ["300"]
+
+    worker_cpus, main_process_cpus = reserve_worker_cpus(3)
+
+    # Verify that the workers are assigned the last cores and that every
+    # thread of the main process is restricted to the remaining ones
+    assert worker_cpus == [2, 3, 4]
+    assert main_process_cpus == {0, 1, 2, 3, 4}
+    mock_sched_setaffinity.assert_has_calls(
+        [call(0, {0, 1}), call(300, {0, 1})]
+    )
+
+
+@patch(SCHED_GETAFFINITY_PATCH_PATH)
+@patch(SCHED_SETAFFINITY_PATCH_PATH)
+def test_reserve_worker_cpus_not_enough_cores(
+    mock_sched_setaffinity: Mock, mock_sched_getaffinity: Mock
+) -> None:
+    mock_sched_getaffinity.return_value = {0, 1, 2}
+
+    worker_cpus, main_process_cpus = reserve_worker_cpus(3)
+
+    # Verify that no cores are assigned and the affinity is left unchanged
+    assert worker_cpus == [None, None, None]
+    assert main_process_cpus is None
+    mock_sched_setaffinity.assert_not_called()
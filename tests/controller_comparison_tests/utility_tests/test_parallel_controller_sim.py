@@ -1,9 +1,13 @@
 from typing import Any
 from unittest.mock import Mock, patch
 
+import numpy as np
 import torch
+import torch.multiprocessing as mp
 
 from data_driven_quad_control.comparison.utilities.parallel_controller_sim import (  # noqa: E501
+    construct_trajectory_data,
+    drain_busy_workers,
     parallel_controller_simulation,
 )
 from data_driven_quad_control.envs.hover_env import HoverEnv
@@ -30,6 +34,9 @@ DD_MPC_WORKER_PATCH_PATH = (
 UPDATE_SIM_PROGRESS_PATCH_PATH = (
     PARELLEL_CONTROLLER_SIM_PATH + "update_simulation_progress"
 )
+DRAIN_BUSY_WORKERS_PATCH_PATH = (
+    PARELLEL_CONTROLLER_SIM_PATH + "drain_busy_workers"
+)
 
 
 @patch(UPDATE_SIM_PROGRESS_PATCH_PATH)
@@ -60,20 +67,20 @@ def test_parallel_controller_sim(
     # Define test parameters
     test_eval_setpoints = [torch.zeros((1, 3))]
 
-    # Patch controller workers to mimic expected queue behavior
+    # Patch controller workers to mimic expected shared memory communication
     def dummy_controller_worker(*args: Any, **kwargs: Any) -> None:
         env_idx = args[0]
-        target_signal_queue = args[-3]
-        action_queue = args[-2]
-        observation_queue = args[-1]
+        target_signal = args[-3]
+        action_slots = args[-2]
+        observation_ring = args[-1]
 
         # Mock controller closed-loop simulation
         # Get target signal
-        target_signal_queue.get()
+        target_signal.receive(env_idx)
 
         # Send dummy action and get dummy observation
-        action_queue.put((env_idx, torch.zeros((mock_env.num_actions))))
-        observation_queue.get()
+        action_slots.write(env_idx, torch.zeros((mock_env.num_actions)))
+        observation_ring.read_into(torch.zeros(observation_ring.payload_size))
 
     # Patch controller workers
     mock_tracking_worker.side_effect = dummy_controller_worker
@@ -124,3 +131,232 @@ def test_parallel_controller_sim(
         assert input_array.shape[1] == num_envs
         assert output_array.shape[1] == num_envs
         assert setpoint_array.shape[1] == num_envs
+
+
+@patch(DD_MPC_WORKER_PATCH_PATH)
+@patch(RL_WORKER_PATCH_PATH)
+@patch(TRACKING_WORKER_PATCH_PATH)
+@patch(DRAIN_BUSY_WORKERS_PATCH_PATH)
+@patch(DD_MPC_WORKER_PATCH_PATH)
+@patch(RL_WORKER_PATCH_PATH)
+@patch(TRACKING_WORKER_PATCH_PATH)
+@patch(MP_GET_START_METHOD_PATCH_PATH)
+def test_parallel_controller_sim_async_stepping(
+    mock_mpc_get_start_method: Mock,
+    mock_tracking_worker: Mock,
+    mock_rl_worker: Mock,
+    mock_dd_mpc_worker: Mock,
+    mock_drain_busy_workers: Mock,
+    mock_env: HoverEnv,
+) -> None:
+    # Mock return value of `mp.get_start_method` to ensure it returns "spawn"
+    # without actually setting it, since it affects external tests
+    mock_mpc_get_start_method.return_value = "spawn"
+
+    # Set the number of environments to three for the mocked env,
+    # one per each controller worker
+    num_envs = 3
+    mock_env.num_envs = num_envs
+    mock_env.obs_buf = torch.zeros((num_envs, mock_env.num_obs))
+    mock_env.rew_buf = torch.zeros((num_envs,))
+    mock_env.reset_buf = torch.zeros((num_envs,))
+
+    # Define test parameters
+    test_eval_setpoints = [torch.zeros((1, 3))]
+    steps_per_setpoint = 5
+    tracking_env_idx = 0  # Slow controller
+    rl_env_idx = 1  # Slow controller
+    dd_mpc_env_idx = 2  # Fast controller
+    slow_env_idxs = [tracking_env_idx, rl_env_idx]
+
+    # Define constant worker actions within the mocked env action bounds
+    # (in env action units, as sent by the tracking and DD-MPC workers)
+    slow_worker_action = torch.tensor([0.2, 0.1, 0.1])
+    fast_worker_action = torch.tensor([0.4, -0.1, -0.1])
+
+    # Event that blocks the slow workers after their first action until the
+    # environment stepping finishes. This way, the fast worker is the only
+    # one that can send actions after the first step.
+    release_slow_workers = mp.Event()
+
+    # Patch controller workers to run a closed loop until the done signal
+    def dummy_controller_worker(*args: Any, **kwargs: Any) -> None:
+        env_idx = args[0]
+        target_signal = args[-3]
+        action_slots = args[-2]
+        observation_ring = args[-1]
+
+        is_slow = env_idx in slow_env_idxs
+        action = slow_worker_action if is_slow else fast_worker_action
+        obs = torch.zeros(observation_ring.payload_size)
+        first_action = True
+
+        while True:
+            env_target_signal = target_signal.receive(env_idx)
+
+            if is_slow and not first_action:
+                release_slow_workers.wait()
+
+            action_slots.write(env_idx, action)
+            observation_ring.read_into(obs)
+            first_action = False
+
+            if env_target_signal.done:
+                break
+
+    # Patch controller workers
+    mock_tracking_worker.side_effect = dummy_controller_worker
+    mock_rl_worker.side_effect = dummy_controller_worker
+    mock_dd_mpc_worker.side_effect = dummy_controller_worker
+
+    # Patch `drain_busy_workers` to release the slow workers once the
+    # environment stepping finishes, before letting them terminate
+    def dummy_drain_busy_workers(*args: Any, **kwargs: Any) -> None:
+        release_slow_workers.set()
+        drain_busy_workers(*args, **kwargs)
+
+    mock_drain_busy_workers.side_effect = dummy_drain_busy_workers
+
+    control_trajectory_data = parallel_controller_simulation(
+        env=mock_env,
+        tracking_env_idx=tracking_env_idx,
+        tracking_controller_init_data=Mock(),
+        rl_env_idx=rl_env_idx,
+        rl_controller_init_data=Mock(),
+        dd_mpc_env_idx=dd_mpc_env_idx,
+        dd_mpc_controller_init_data=Mock(),
+        eval_setpoints=test_eval_setpoints,
+        steps_per_setpoint=steps_per_setpoint,
+        async_stepping=True,
+    )
+
+    # Verify that the slow workers were only released after stepping
+    mock_drain_busy_workers.assert_called_once()
+
+    # Verify that action freshness is recorded for each drone and step
+    action_freshness = control_trajectory_data.action_freshness
+    assert action_freshness is not None
+    assert len(action_freshness) == num_envs
+    for env_freshness in action_freshness:
+        assert env_freshness.shape == (steps_per_setpoint,)
+
+    # Verify that the first step waits for the actions of all workers
+    assert all(env_freshness[0] for env_freshness in action_freshness)
+
+    # Verify that the slow controller actions are only fresh in the first
+    # step, as the env is stepped without waiting for their next actions
+    for env_idx in slow_env_idxs:
+        np.testing.assert_array_equal(
+            action_freshness[env_idx],
+            [True] + [False] * (steps_per_setpoint - 1),
+        )
+
+    # Verify that the fast controller action is fresh in every step, as it
+    # is the only worker with a pending action after the first step
+    assert action_freshness[dd_mpc_env_idx].all()
+
+    # Verify that the slow controller drone is stepped with its first action
+    # in every step, instead of the initial zero actions
+    slow_control_inputs = control_trajectory_data.control_inputs[
+        tracking_env_idx
+    ]
+    np.testing.assert_allclose(
+        slow_control_inputs,
+        np.tile(slow_worker_action.numpy(), (steps_per_setpoint, 1)),
+    )
+    np.testing.assert_allclose(
+        control_trajectory_data.control_inputs[dd_mpc_env_idx],
+        np.tile(fast_worker_action.numpy(), (steps_per_setpoint, 1)),
+    )
+
+
+def test_construct_trajectory_data() -> None:
+    # Define env action bounds (thrust, roll rate, pitch rate)
+    env_action_bounds = torch.tensor([[0.0, 1.0], [-0.5, 0.5], [-0.3, 0.3]])
+    rl_env_idx = 1
+    num_steps = 3
+
+    # Define the action history (steps, envs, actions), where the RL agent
+    # actions are normalized to [-1, 1] and the others are in env action
+    # units. The last step exceeds `num_steps` and must be discarded.
+    action_hist = torch.tensor(
+        [
+            [[0.5, 0.1, -0.1], [0.0, 0.0, 0.0], [0.3, 0.2, 0.1]],
+            [[1.5, -0.7, 0.2], [1.0, -1.0, 0.5], [0.3, 0.2, 0.1]],
+            [[0.2, 0.0, 0.4], [-2.0, 0.4, 2.0], [-0.1, 0.6, -0.4]],
+            [[9.0, 9.0, 9.0], [9.0, 9.0, 9.0], [9.0, 9.0, 9.0]],
+        ]
+    )
+
+    # Define drone positions as [step, env, 10 * step + env]
+    # and target positions as [step, step, step]
+    pos_hist = torch.tensor(
+        [
+            [[float(k), float(i), 10.0 * k + i] for i in range(3)]
+            for k in range(4)
+        ]
+    )
+    target_pos_hist = torch.arange(4, dtype=torch.float).repeat(3, 1).T
+
+    # Define the action freshness history (steps, envs)
+    action_freshness_hist = torch.tensor(
+        [
+            [True, True, True],
+            [True, True, False],
+            [True, False, False],
+            [False, False, False],
+        ]
+    )
+
+    control_trajectory_data = construct_trajectory_data(
+        env_action_bounds=env_action_bounds,
+        action_hist=action_hist,
+        rl_env_idx=rl_env_idx,
+        pos_hist=pos_hist,
+        target_pos_hist=target_pos_hist,
+        num_steps=num_steps,
+        action_freshness_hist=action_freshness_hist,
+    )
+
+    # Verify control inputs per env and step, where the RL agent inputs are
+    # inverse normalized to the action bounds, and all the inputs are
+    # clipped to the action bounds
+    expected_control_inputs = [
+        np.array([[0.5, 0.1, -0.1], [1.0, -0.5, 0.2], [0.2, 0.0, 0.3]]),
+        np.array([[0.5, 0.0, 0.0], [1.0, -0.5, 0.15], [0.0, 0.2, 0.3]]),
+        np.array([[0.3, 0.2, 0.1], [0.3, 0.2, 0.1], [0.0, 0.5, -0.3]]),
+    ]
+    assert len(control_trajectory_data.control_inputs) == 3
+    for control_inputs, expected in zip(
+        control_trajectory_data.control_inputs,
+        expected_control_inputs,
+        strict=True,
+    ):
+        np.testing.assert_allclose(control_inputs, expected, rtol=1e-6)
+
+    # Verify system outputs (drone positions) per env and step
+    assert len(control_trajectory_data.system_outputs) == 3
+    for i, system_outputs in enumerate(control_trajectory_data.system_outputs):
+        expected_outputs = np.array(
+            [[k, i, 10.0 * k + i] for k in range(num_steps)]
+        )
+        np.testing.assert_allclose(system_outputs, expected_outputs)
+
+    # Verify setpoints (target positions) per step
+    np.testing.assert_allclose(
+        control_trajectory_data.system_setpoint,
+        np.array([[k, k, k] for k in range(num_steps)]),
+    )
+
+    # Verify action freshness per env and step
+    action_freshness = control_trajectory_data.action_freshness
+    assert action_freshness is not None
+    expected_freshness = [
+        np.array([True, True, True]),
+        np.array([True, True, False]),
+        np.array([True, False, False]),
+    ]
+    for freshness, expected in zip(
+        action_freshness, expected_freshness, strict=True
+    ):
+        np.testing.assert_array_equal(freshness, expected)
@@ -0,0 +1,181 @@
+import numpy as np
+import torch
+
+from data_driven_quad_control.comparison.utilities.controller_comparison_config import (  # noqa: E501
+    EnvTargetSignal,
+)
+from data_driven_quad_control.comparison.utilities.shared_memory_ipc import (  # noqa: E501
+    CACHE_LINE_SIZE,
+    SharedActionSlots,
+    SharedMemoryRing,
+    SharedTargetSignal,
+    SharedTensorChannel,
+)
+
+
+def test_shared_memory_ring_write_read() -> None:
+    ring = SharedMemoryRing(payload_size=7, capacity=3)
+
+    # Write payloads built from multiple parts of different types
+    pos = torch.tensor([[1.0, 2.0, 3.0]])
+    quat = np.array([0.0, 0.0, 0.0, 1.0])
+    ring.write(pos, quat)
+    ring.write(torch.arange(7, dtype=torch.float))
+
+    assert len(ring) == 2
+
+    # Verify payloads are read in FIFO order
+    dst = torch.zeros(7)
+    ring.read_into(dst)
+    torch.testing.assert_close(
+        dst, torch.tensor([1.0, 2.0, 3.0, 0.0, 0.0, 0.0, 1.0])
+    )
+
+    ring.read_into(dst)
+    torch.testing.assert_close(dst, torch.arange(7, dtype=torch.float))
+
+    assert len(ring) == 0
+
+
+def test_shared_memory_ring_wraps_around() -> None:
+    ring = SharedMemoryRing(payload_size=1, capacity=2)
+    dst = torch.zeros(1)
+
+    # Write and read more payloads than the ring capacity
+    for i in range(5):
+        ring.write(torch.tensor([float(i)]))
+        ring.read_into(dst)
+
+        assert dst.item() == float(i)
+
+    assert len(ring) == 0
+
+
+def test_shared_memory_ring_cache_line_layout() -> None:
+    ring = SharedMemoryRing(payload_size=3)
+
+    # Verify that the head index, the tail index, and the payload slots
+    # start on distinct, cache line-aligned addresses
+    head_addr = ring._head.ctypes.data
+    tail_addr = ring._tail.ctypes.data
+    slots_addr = ring.buffer.data_ptr()
+    assert head_addr % CACHE_LINE_SIZE == 0
+    assert tail_addr - head_addr == CACHE_LINE_SIZE
+    assert slots_addr - tail_addr == CACHE_LINE_SIZE
+
+    ring.close()
+
+
+def test_shared_memory_ring_pickling() -> None:
+    ring = SharedMemoryRing(payload_size=3)
+
+    # Rings restored from their pickled state (as done when sent to worker
+    # processes) attach to the same shared memory block without owning it
+    attached_ring = SharedMemoryRing.__new__(SharedMemoryRing)
+    attached_ring.__setstate__(ring.__getstate__())
+    assert not attached_ring._is_owner
+
+    attached_ring.write(torch.tensor([1.0, 2.0, 3.0]))
+    assert len(ring) == 1
+
+    dst = torch.zeros(3)
+    ring.read_into(dst)
+    torch.testing.assert_close(dst, torch.tensor([1.0, 2.0, 3.0]))
+
+    attached_ring.close()
+    ring.close()
+
+
+def test_shared_target_signal_broadcast() -> None:
+    receiver_ids = [0, 1, 2]
+    shared_target_signal = SharedTargetSignal(receiver_ids=receiver_ids)
+    target_signal = EnvTargetSignal(
+        target_pos=torch.tensor([[0.5, -0.5, 1.0]]),
+        is_new_target=True,
+        done=False,
+    )
+
+    shared_target_signal.broadcast(target_signal)
+
+    # Verify that every receiver gets the broadcast signal
+    for receiver_id in receiver_ids:
+        received_signal = shared_target_signal.receive(receiver_id)
+
+        torch.testing.assert_close(
+            received_signal.target_pos, target_signal.target_pos
+        )
+        assert received_signal.is_new_target is True
+        assert received_signal.done is False
+
+
+def test_shared_action_slots() -> None:
+    action_slots = SharedActionSlots(
+        num_slots=4, slot_size=2, writer_ids=[0, 2, 3]
+    )
+
+    # Write actions from each writer
+    action_slots.write(0, torch.tensor([1.0, 2.0]))
+    action_slots.write(2, np.array([3.0, 4.0]))
+    action_slots.write(3, torch.tensor([[5.0, 6.0]]))
+
+    # Verify that all actions are read at once, and
+    # that slots without writers remain unchanged
+    actions = action_slots.wait_all()
+    expected_actions = torch.tensor(
+        [[1.0, 2.0], [0.0, 0.0], [3.0, 4.0], [5.0, 6.0]]
+    )
+    torch.testing.assert_close(actions, expected_actions)
+
+
+def test_shared_action_slots_wait_any() -> None:
+    action_slots = SharedActionSlots(
+        num_slots=3, slot_size=1, writer_ids=[0, 1, 2]
+    )
+
+    # Write actions from a subset of writers
+    action_slots.write(0, torch.tensor([1.0]))
+    action_slots.write(2, torch.tensor([3.0]))
+
+    # Verify that only the writers with ready actions are returned
+    ready_writer_ids = action_slots.wait_any(writer_ids=[0, 1, 2])
+    assert sorted(ready_writer_ids) == [0, 2]
+
+    torch.testing.assert_close(
+        action_slots.actions, torch.tensor([[1.0], [0.0], [3.0]])
+    )
+
+
+def test_shared_target_signal_missed_new_target() -> None:
+    shared_target_signal = SharedTargetSignal(receiver_ids=[0, 1])
+    new_target_signal = EnvTargetSignal(
+        target_pos=torch.tensor([[1.0, 1.0, 1.0]]),
+        is_new_target=True,
+        done=False,
+    )
+    same_target_signal = EnvTargetSignal(
+        target_pos=torch.tensor([[1.0, 1.0, 1.0]]),
+        is_new_target=False,
+        done=False,
+    )
+
+    # Broadcast a new target to receiver 0 only (e.g., receiver 1 is busy)
+    shared_target_signal.broadcast(new_target_signal, receiver_ids=[0])
+    assert shared_target_signal.receive(0).is_new_target is True
+
+    # Verify that receiver 1 still detects the new target later on
+    shared_target_signal.broadcast(same_target_signal)
+    assert shared_target_signal.receive(0).is_new_target is False
+    assert shared_target_signal.receive(1).is_new_target is True
+
+
+def test_shared_tensor_channel_write_read() -> None:
+    channel = SharedTensorChannel(payload_size=3, capacity=2)
+
+    # Write and read more payloads than the channel capacity
+    dst = torch.zeros(3)
+    for i in range(5):
+        payload = torch.full((1, 3), float(i))
+        channel.write(payload)
+        channel.read_into(dst)
+
+        torch.testing.assert_close(dst, payload.reshape(-1))
@@ -1,3 +1,4 @@
+from types import MethodType
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -5,7 +6,10 @@ import numpy as np
 import pytest
 import torch
 
-from data_driven_quad_control.envs.hover_env import HoverEnv
+from data_driven_quad_control.envs.hover_env import (
+    HoverEnv,
+    compute_post_physics_state,
+)
 from data_driven_quad_control.envs.hover_env_config import EnvActionType
 
 
@@ -38,15 +42,21 @@ def test_hover_env_loop(
 
     # Step environment
     num_steps = 5
-    with torch.no_grad():
+    dummy_actions = torch.zeros(
+        (num_envs, env.num_actions), dtype=torch.float, device=env.device
+    )
+    with torch.inference_mode():
         for _ in range(num_steps):
-            dummy_actions = torch.zeros(
-                (num_envs, env.num_actions),
-                dtype=torch.float,
-                device=env.device,
-            )
+            prev_obs = obs
+            prev_obs_values = prev_obs.clone()
+
             obs, reward, done, info = env.step(dummy_actions)
 
+            # Verify that stepping does not overwrite previously returned
+            # observations (rollout storages keep references to them)
+            assert obs is not prev_obs
+            torch.testing.assert_close(prev_obs, prev_obs_values)
+
             assert obs.shape == (num_envs, env.num_obs)
             assert reward.shape == (num_envs,)
             assert done.shape == (num_envs,)
@@ -60,6 +70,91 @@ def test_hover_env_loop(
         assert f"rew_{k}" in env.extras["episode"]
 
 
+def test_env_compiled_post_physics_matches_eager() -> None:
+    torch.manual_seed(0)
+
+    # Define random drone states, where some drones exceed
+    # the termination thresholds or are close to the ground
+    num_envs = 8
+    base_quat = torch.randn((num_envs, 4))
+    base_quat = base_quat / base_quat.norm(dim=1, keepdim=True)
+    post_physics_inputs = {
+        "base_pos": torch.randn((num_envs, 3)) + 1.0,
+        "last_base_pos": torch.randn((num_envs, 3)) + 1.0,
+        "base_quat": base_quat,
+        "inv_base_init_quat": torch.tensor([1.0, 0.0, 0.0, 0.0]),
+        "commands": torch.randn((num_envs, 3)),
+        "world_lin_vel": 10 * torch.randn((num_envs, 3)),
+        "world_ang_vel": 10 * torch.randn((num_envs, 3)),
+        "squared_termination_thresholds": torch.tensor(
+            [180.0, 180.0, 3.0, 3.0, 2.0, *[12.0] * 3, *[20.0] * 3]
+        ).square(),
+        "min_base_height": 0.1,
+    }
+
+    # Compute the post-physics state eagerly and with `torch.compile`
+    eager_outputs = compute_post_physics_state(**post_physics_inputs)
+    compiled_outputs = torch.compile(
+        compute_post_physics_state, dynamic=False
+    )(**post_physics_inputs)
+
+    # Verify that the compiled outputs match the eager outputs
+    for eager_output, compiled_output in zip(
+        eager_outputs, compiled_outputs, strict=True
+    ):
+        torch.testing.assert_close(compiled_output, eager_output)
+
+
+def test_env_compiled_rewards_match_eager(mock_env: HoverEnv) -> None:
+    torch.manual_seed(0)
+
+    # Mock the drone states used by the reward functions
+    num_envs = 8
+    num_actions = mock_env.num_actions
+    mock_env.num_envs = num_envs
+    mock_env.rel_pos = torch.randn((num_envs, 3)) * 0.1
+    mock_env.last_rel_pos = torch.randn((num_envs, 3)) * 0.1
+    mock_env.actions = torch.rand((num_envs, num_actions)) * 2 - 1
+    mock_env.last_actions = torch.rand((num_envs, num_actions)) * 2 - 1
+    mock_env.base_euler = torch.rand((num_envs, 3)) * 360 - 180
+    mock_env.base_ang_vel = torch.randn((num_envs, 3))
+    mock_env.hover_counter = torch.randint(0, 10, (num_envs,), dtype=torch.int)
+    mock_env.crash_condition = torch.rand(num_envs) < 0.5
+
+    # Mock the reward constants and scales
+    mock_env.inv_at_target_threshold_square = 1 / 0.1**2
+    mock_env.yaw_lambda = -10.0
+    mock_env.deg_to_rad = 3.14159 / 180
+    mock_env.inv_pi = 1 / 3.14159
+    reward_names = [
+        "target",
+        "closeness",
+        "hover_time",
+        "smooth",
+        "yaw",
+        "angular",
+        "crash",
+    ]
+    mock_env.reward_functions = {
+        name: MethodType(getattr(HoverEnv, "_reward_" + name), mock_env)
+        for name in reward_names
+    }
+    mock_env.reward_scales_buf = torch.linspace(
+        -1.0, 1.0, len(reward_names)
+    ).unsqueeze(1)
+
+    # Compute the scaled rewards eagerly and with `torch.compile`
+    compute_rewards = MethodType(HoverEnv.compute_rewards, mock_env)
+    eager_rewards = compute_rewards()
+    compiled_rewards = torch.compile(compute_rewards, dynamic=False)()
+
+    # Verify that the compiled rewards and their sums match the eager ones
+    torch.testing.assert_close(compiled_rewards, eager_rewards)
+    torch.testing.assert_close(
+        compiled_rewards.sum(dim=0), eager_rewards.sum(dim=0)
+    )
+
+
 @pytest.mark.parametrize("require_stabilization", [True, False])
 def test_env_hovering_at_target(
     require_stabilization: bool,
@@ -71,6 +166,7 @@ def test_env_hovering_at_target(
         (num_envs,), device=mock_env.device, dtype=torch.int
     )
     mock_env.at_target_threshold = 1.0
+    mock_env.at_target_threshold_square = 1.0
     mock_env.rel_pos = torch.tensor(
         [
             [0.0, 0.0, 0.0],  # Drone at target
@@ -85,22 +181,22 @@ def test_env_hovering_at_target(
         # Only update the hover counter of drones at target
         stabilized_at_target = HoverEnv._hovering_at_target(mock_env)
 
-        assert stabilized_at_target.numel() == 0
+        assert stabilized_at_target.tolist() == [False, False]
         assert mock_env.hover_counter.tolist() == [1, 0]
 
         # Second call:
-        # Update the hover counter and return the indices of drones that have
+        # Update the hover counter and return the mask of drones that have
         # been at target for at least `min_hover_steps` (drone idx 0)
         stabilized_at_target = HoverEnv._hovering_at_target(mock_env)
 
         assert mock_env.hover_counter.tolist() == [2, 0]
-        assert torch.equal(stabilized_at_target, torch.tensor([0]))
+        assert stabilized_at_target.tolist() == [True, False]
     else:
         at_target = HoverEnv._hovering_at_target(mock_env)
 
-        # Verify that drone indices are returned
-        # immediately when they reach the target
-        assert torch.equal(at_target, torch.tensor([0]))
+        # Verify that drones are marked immediately
+        # when they reach the target
+        assert at_target.tolist() == [True, False]
 
 
 @pytest.mark.parametrize("add_obs_noise", [True, False])
@@ -133,11 +229,42 @@ def test_env_compute_observations(
         [pos, quat, lin_vel, ang_vel, last_actions], dim=-1
     )
 
+    # Allocate the observation scratch and noise
+    # buffers used by `compute_observations`
+    mock_env.obs_scratch_buf = torch.zeros_like(expected_obs)
+    mock_env.obs_noise_buf = torch.zeros((mock_env.num_envs, 13))
+
     # Test `HoverEnv.compute_observations`
     obs = HoverEnv.compute_observations(mock_env)
 
     # Verify that the computed observation matches the expected tensor
+    # and that it is returned as a copy of the scratch buffer
     torch.testing.assert_close(obs, expected_obs)
+    assert obs is not mock_env.obs_scratch_buf
+
+
+def test_env_compute_observations_not_overwritten(
+    mock_env: HoverEnv,
+) -> None:
+    # Allocate the observation scratch buffer used by `compute_observations`
+    mock_env.obs_scratch_buf = torch.zeros(
+        (mock_env.num_envs, 13 + mock_env.num_actions)
+    )
+    mock_env.obs_noise_buf = torch.zeros((mock_env.num_envs, 13))
+
+    # Compute an observation and keep a copy of its values
+    obs = HoverEnv.compute_observations(mock_env)
+    obs_values = obs.clone()
+
+    # Update the drone state and compute the next observation
+    mock_env.rel_pos = mock_env.rel_pos + 0.1
+    mock_env.last_actions = mock_env.last_actions * 0.5
+    next_obs = HoverEnv.compute_observations(mock_env)
+
+    # Verify that the previously returned observation is not overwritten
+    # (rollout storages keep references to previous observations)
+    torch.testing.assert_close(obs, obs_values)
+    assert not torch.equal(next_obs, obs)
 
 
 @pytest.mark.parametrize("add_noise", [True, False])
@@ -214,6 +341,12 @@ def test_initialize_debug_drone_colors(
         assert mock_env.drone_offsets.shape == (num_envs, 3)
         assert mock_env.drone_colors_enabled
         assert mock_env.drone_colors == test_drone_colors
+
+        # Verify that drones are grouped by color
+        assert len(mock_env.drone_color_groups) == 1
+        color, env_idxs = mock_env.drone_color_groups[0]
+        assert color == dummy_color
+        assert env_idxs.tolist() == list(range(num_envs))
     else:
         # Verify that a `ValueError` exception is raised
         # with invalid color lists
@@ -226,13 +359,17 @@ def test_initialize_debug_drone_colors(
 def test_draw_colored_spheres(mock_env: HoverEnv) -> None:
     # Define test parameters
     num_envs = 3
-    dummy_color = (1.0, 0.0, 0.0, 1.0)
-    dummy_drone_colors = [dummy_color] * num_envs
+    red_color = (1.0, 0.0, 0.0, 1.0)
+    blue_color = (0.0, 0.0, 1.0, 1.0)
     test_local_pos = torch.zeros((num_envs, 3))
 
     # Override number of environments in the mocked env
+    # and group drones by color
     mock_env.num_envs = num_envs
-    mock_env.drone_colors = dummy_drone_colors
+    mock_env.drone_color_groups = [
+        (red_color, torch.tensor([0, 2])),
+        (blue_color, torch.tensor([1])),
+    ]
 
     # Mock the `scene` attribute in the mocked env
     mock_env.scene = Mock()
@@ -247,6 +384,10 @@ def test_draw_colored_spheres(mock_env: HoverEnv) -> None:
     # Call method
     HoverEnv.draw_colored_spheres(mock_env)
 
-    # Verify scene methods were called the expected number of times
+    # Verify that spheres are drawn in a single call per color
     mock_env.scene.clear_debug_objects.assert_called_once()
-    assert mock_env.scene.draw_debug_sphere.call_count == num_envs
+    assert mock_env.scene.draw_debug_spheres.call_count == 2
+
+    red_call_kwargs = mock_env.scene.draw_debug_spheres.call_args_list[0][1]
+    assert red_call_kwargs["color"] == red_color
+    torch.testing.assert_close(red_call_kwargs["poss"], torch.ones((2, 3)))
@@ -61,6 +61,14 @@ class MockHoverEnv:
     ) -> torch.Tensor:
         return input_tensor + self.obs_noise_std
 
+    def _add_noise_(
+        self,
+        input_tensor: torch.Tensor,
+        noise_buf: torch.Tensor,
+        noise_std: float,
+    ) -> torch.Tensor:
+        return input_tensor.add_(self.obs_noise_std)
+
     def update_target_pos(
         self, envs_idx: torch.Tensor, target_pos: torch.Tensor
     ) -> None:
@@ -1,5 +1,6 @@
 from dataclasses import asdict
 from typing import Any
+from unittest.mock import Mock
 
 import pytest
 import torch
@@ -8,6 +9,7 @@ from data_driven_quad_control.envs.hover_env_config import EnvActionType
 from data_driven_quad_control.utilities.drone_environment import (
     create_env,
     get_current_env_state,
+    get_tensor_from_env_idx,
     restore_env_from_state,
     update_env_target_pos,
 )
@@ -76,6 +78,36 @@ def test_hover_env_utilities(
     ), "Env states differ after restore."
 
 
+def test_get_tensor_from_env_idx_cached_read_only() -> None:
+    mock_env = Mock()
+    mock_env.device = torch.device("cpu")
+
+    # Verify that int and sequence indices return the same cached tensor
+    env_idx_tensor = get_tensor_from_env_idx(env=mock_env, env_idx=1)
+    assert torch.equal(env_idx_tensor, torch.tensor([1]))
+    assert env_idx_tensor.dtype == torch.long
+    assert get_tensor_from_env_idx(env=mock_env, env_idx=[1]) is (
+        env_idx_tensor
+    )
+    assert get_tensor_from_env_idx(env=mock_env, env_idx=(1,)) is (
+        env_idx_tensor
+    )
+
+    # Verify that the cached tensor can be used for indexing,
+    # but cannot be modified in place
+    data = torch.arange(4.0)
+    data[env_idx_tensor] = -1.0
+    assert torch.equal(data, torch.tensor([0.0, -1.0, 2.0, 3.0]))
+    with pytest.raises(RuntimeError):
+        env_idx_tensor.add_(1)
+
+    # Verify that the cached tensor is not affected by modified clones
+    env_idx_tensor.clone().add_(1)
+    assert torch.equal(
+        get_tensor_from_env_idx(env=mock_env, env_idx=1), torch.tensor([1])
+    )
+
+
 def compare_dicts_str_tensor(
     dict_1: dict[str, Any], dict_2: dict[str, Any]
 ) -> bool:
@@ -5,6 +5,7 @@ from data_driven_quad_control.utilities.math_utils import (
     gs_rand_float,
     linear_interpolate,
     quaternion_to_matrix,
+    rotate_vectors_by_quaternion,
     yaw_from_quaternion,
     yaw_to_quaternion,
 )
@@ -71,6 +72,29 @@ def test_quaternion_to_matrix_known_yaw() -> None:
     assert_close(rot_matrix, expected_matrix)
 
 
+def test_rotate_vectors_by_quaternion() -> None:
+    # Rotate two stacked vectors per quaternion
+    yaw_deg = torch.tensor([0.0, 90.0])
+    quats = yaw_to_quaternion(torch.deg2rad(yaw_deg))
+    vectors = torch.tensor(
+        [
+            [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+            [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+        ]
+    )
+
+    rotated_vectors = rotate_vectors_by_quaternion(vectors, quats[:, None])
+
+    # Verify that the result matches rotating with rotation matrices
+    expected = torch.einsum(
+        "nij,nkj->nki", quaternion_to_matrix(quats), vectors
+    )
+
+    assert rotated_vectors.shape == (2, 2, 3)
+    assert_close(rotated_vectors, expected)
+    assert_close(rotated_vectors[1, 0], torch.tensor([0.0, 1.0, 0.0]))
+
+
 def test_yaw_from_quaternion() -> None:
     quats = torch.tensor(
         [